@@ -0,0 +1,59 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from utils.artifact import ModelArtifact
+from utils.features import FEATURE_COLUMNS, FeatureCache
+from utils.forest import FlatForest
+
+
+def measure(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return float(np.median(times))
+
+
+def sample_rows(data_path, n, rng):
+    """``n`` feature rows from the scraped data if it exists, else random rows in the model's feature ranges."""
+    if data_path and os.path.exists(data_path):
+        X, _, _ = FeatureCache(data_path).load()
+        return X[rng.integers(0, len(X), n)]
+    return rng.uniform(0, 100, size=(n, len(FEATURE_COLUMNS)))
+
+
+def bench(model, flat, X, repeat):
+    import pandas as pd
+
+    frame = pd.DataFrame(X, columns=FEATURE_COLUMNS)
+    diff = np.abs(model.predict_proba(frame) - flat.predict_proba(X)).max()
+    sklearn_s = measure(lambda: model.predict_proba(frame), repeat)
+    flat_s = measure(lambda: flat.predict_proba(X), repeat)
+    print(f"{len(X):>6} rows | sklearn: {sklearn_s * 1000:9.2f} ms | flat: {flat_s * 1000:9.2f} ms | "
+          f"{sklearn_s / flat_s:5.1f}x | max |diff| {diff:.1e}")
+    return diff
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare sklearn predict_proba with the flattened forest")
+    parser.add_argument("--model", default="model/cs2_model.pkl", help="Trained model (default: model/cs2_model.pkl)")
+    parser.add_argument("--data", default="data/hltv_data.jsonl", help="Match data to draw rows from (default: data/hltv_data.jsonl)")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1, 7, 10000], help="Batch sizes (default: 1 7 10000)")
+    parser.add_argument("--repeat", type=int, default=20, help="Runs per measurement, median reported (default: 20)")
+    parser.add_argument("--atol", type=float, default=1e-9, help="Largest allowed probability difference (default: 1e-9)")
+    args = parser.parse_args()
+
+    model = ModelArtifact.load(args.model)
+    start = time.perf_counter()
+    flat = FlatForest.compile(model)
+    print(f"Compiled {len(flat.roots)} trees ({len(flat.threshold)} splits, {len(flat.leaf_values)} leaves) "
+          f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    rng = np.random.default_rng(0)
+    worst = max(bench(model, flat, sample_rows(args.data, n, rng), args.repeat) for n in args.rows)
+    if worst > args.atol:
+        raise SystemExit(f"Probabilities differ by {worst:.1e} (> {args.atol:.0e})")
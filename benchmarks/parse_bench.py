@@ -0,0 +1,86 @@
+import argparse
+import time
+import tracemalloc
+
+from bs4 import BeautifulSoup
+
+from utils.driver import HTMLUtils
+from utils.parsing import PageParser
+
+# extractor -> (strainer, function reading the node it needs from a soup)
+EXTRACTORS = {
+    "player": (PageParser.STATS_TABLE,
+               lambda soup: soup.find(class_='stats-table').find_all("tr", class_=["group-1", "group-2"], limit=10)),
+    "recent": (PageParser.STATS_TABLE,
+               lambda soup: soup.find(class_='stats-table').find_all("tr", class_=["group-1", "group-2"], limit=10)),
+    "winrate": (PageParser.LARGE_STRONG, lambda soup: soup.find_all(class_='large-strong')[1].text),
+    "h2h": (PageParser.HEAD_TO_HEAD, lambda soup: soup.find(class_='head-to-head').find_all(class_='bold')),
+    "team-line": (PageParser.TEAM_LINE, HTMLUtils.get_team_line_expanded),
+}
+
+
+def measure(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def sample_page(filler_rows=2000):
+    """A synthetic page shaped like HLTV's, with extra classes on every node the strainers target."""
+    filler = "".join(f'<div class="filler row-{i}"><span class="cell">{i}</span><a href="/x/{i}">x</a></div>'
+                     for i in range(filler_rows))
+    rows = "".join(f'<tr class="group-{i % 2 + 1}"><td class="statsMapPlayed">Mirage</td>'
+                   f'<td class="statsCenterText">{10 + i}-{8 + i}</td><td class="match-won won">1.1{i}</td></tr>'
+                   for i in range(12))
+    return (f'<html><body>{filler}'
+            f'<table class="stats-table players sortable">{rows}</table>'
+            f'<div class="col standard-box big-padding"><div class="large-strong">12</div></div>'
+            f'<div class="col standard-box big-padding"><div class="large-strong stat">7 / 1 / 4</div></div>'
+            f'<div class="head-to-head standard-box"><div class="bold">3</div><div class="bold">0</div>'
+            f'<div class="bold">2</div></div>'
+            f'<div class="teamLineExpanded ranking-header">#5 <span class="points small">(512 points)</span></div>'
+            f'{filler}</body></html>')
+
+
+def bench(name, html, repeat):
+    strainer, extract = EXTRACTORS[name]
+    # The targeted parse has to find exactly what the full one does, or the speedup is meaningless
+    full_result, part_result = extract(BeautifulSoup(html, "html.parser")), extract(PageParser.parse(html, strainer))
+    if str(full_result) != str(part_result):
+        raise SystemExit(f"{name}: targeted parse found {part_result!r}, full parse found {full_result!r}")
+    full_s, full_mem = measure(lambda: extract(BeautifulSoup(html, "html.parser")), repeat)
+    part_s, part_mem = measure(lambda: extract(PageParser.parse(html, strainer)), repeat)
+    print(f"{name:<10} html.parser full: {full_s * 1000:8.1f} ms {full_mem / 1024 / 1024:7.1f} MB | "
+          f"{PageParser.PARSER} targeted: {part_s * 1000:8.1f} ms {part_mem / 1024 / 1024:7.1f} MB | "
+          f"{full_s / part_s:5.1f}x faster")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare full html.parser trees with targeted parsing on saved HLTV pages")
+    for name in EXTRACTORS:
+        parser.add_argument(f"--{name}", metavar="HTML_FILE", help=f"Saved page for the {name} extractor")
+    parser.add_argument("--sample", action="store_true", help="Run every extractor on a synthetic page with multi-class target nodes")
+    parser.add_argument("--repeat", type=int, default=10, help="Parses per measurement (default: 10)")
+    args = parser.parse_args()
+
+    if args.sample:
+        html = sample_page()
+        for name in EXTRACTORS:
+            bench(name, html, args.repeat)
+        raise SystemExit(0)
+
+    pages = {name: getattr(args, name.replace("-", "_")) for name in EXTRACTORS}
+    if not any(pages.values()):
+        parser.error("pass at least one saved page, e.g. --player data/pages/player.html, or --sample")
+
+    for name, path in pages.items():
+        if path:
+            with open(path, "r", encoding="utf-8") as f:
+                bench(name, f.read(), args.repeat)
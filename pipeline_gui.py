@@ -4,21 +4,27 @@ import os
 import subprocess
 import sys
 import threading
+import time
 import tkinter as tk
 from datetime import datetime, timedelta
 from tkinter import filedialog, messagebox, ttk
 
-import joblib
 import matplotlib.pyplot as plt
 import numpy as np
-import pandas as pd
-from bs4 import BeautifulSoup
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+from utils.archive import PageArchive
+from utils.artifact import ModelArtifact
 from utils.database import Database as DB
 from utils.dictionary import Dictionary
-from utils.driver import HTMLUtils, Driver
+from utils.driver import HTMLUtils, DriverPool
+from utils.features import Features
+from utils.fetch import HttpFetcher, PageFetcher, PageMemo
+from utils.forest import FlatForest
 from utils.helpers import Utils, Cache, Settings
+from utils.parsing import PageParser
+from utils.ratelimit import RateLimiter
+from utils.taskgraph import TaskGraph
 
 # --------------------------
 # GLOBAL VARS
@@ -27,14 +33,30 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DEFAULT_MODEL_DIR = os.path.join(BASE_DIR, "model", "cs2_model.pkl")
 DEFAULT_CACHE_DB = os.path.join(BASE_DIR, "data", "cache.db")
 DEFAULT_CACHE_EXPIRY_HOURS = 12
+DEFAULT_CACHE_MAX_ENTRIES = 0  # 0 = unlimited
+DEFAULT_CACHE_MAX_MB = 0  # 0 = unlimited
+CACHE_SWEEP_INTERVAL_S = 30 * 60
 DEFAULT_HEADLESS = False
+DEFAULT_DRIVER_POOL_SIZE = 3
+DEFAULT_FETCH_BACKEND = "auto"  # HTTP first, browser only for challenge pages
+COOKIE_FILE = os.path.join(BASE_DIR, "config", "cookies.json")
+ARCHIVE_DIR = os.path.join(BASE_DIR, "data", "pages")  # Shared with the scraper's page archive
+FETCH_RATE = 1.0  # Page loads per second shared by all drivers
+FETCH_BURST = 4
+MAX_CHALLENGE_RETRIES = 3
+PAGE_MEMO_SIZE = 16  # Pages kept for the prediction in progress
+FLAT_FOREST_MAX_ROWS = 512  # Larger batches are faster through sklearn's own predict_proba
 DEFAULT_THEME_PREF = "system"
 
 CACHE_EXPIRY_HOURS = DEFAULT_CACHE_EXPIRY_HOURS
+CACHE_MAX_ENTRIES = DEFAULT_CACHE_MAX_ENTRIES
+CACHE_MAX_MB = DEFAULT_CACHE_MAX_MB
 CACHE_DB = DEFAULT_CACHE_DB
 MODEL_DIR = DEFAULT_MODEL_DIR
 
 HEADLESS_MODE = DEFAULT_HEADLESS
+DRIVER_POOL_SIZE = DEFAULT_DRIVER_POOL_SIZE
+FETCH_BACKEND = DEFAULT_FETCH_BACKEND
 THEME_PREFERENCE = DEFAULT_THEME_PREF
 
 # --------------------------
@@ -42,9 +64,13 @@ THEME_PREFERENCE = DEFAULT_THEME_PREF
 # --------------------------
 def _normalize_settings(settings):
     dev = settings.get("cache_expiry_hours", DEFAULT_CACHE_EXPIRY_HOURS)
+    dcme = settings.get("cache_max_entries", DEFAULT_CACHE_MAX_ENTRIES)
+    dcmm = settings.get("cache_max_mb", DEFAULT_CACHE_MAX_MB)
     dcdb = settings.get("cache_db_path", DEFAULT_CACHE_DB)
     dmd = settings.get("model_path", DEFAULT_MODEL_DIR)
     headless = settings.get("headless", DEFAULT_HEADLESS)
+    pool_size = settings.get("driver_pool_size", DEFAULT_DRIVER_POOL_SIZE)
+    backend = settings.get("fetch_backend", DEFAULT_FETCH_BACKEND)
     theme_pref = settings.get("theme", DEFAULT_THEME_PREF)
 
     if isinstance(headless, str):
@@ -56,20 +82,28 @@ def _normalize_settings(settings):
 
     normalized = {
         "cache_expiry_hours": Cache.normalize_cache_expiry(dev, DEFAULT_CACHE_EXPIRY_HOURS),
+        "cache_max_entries": Cache.normalize_cache_limit(dcme, DEFAULT_CACHE_MAX_ENTRIES),
+        "cache_max_mb": Cache.normalize_cache_limit(dcmm, DEFAULT_CACHE_MAX_MB),
         "cache_db_path": Cache.validate_cache_db_path(dcdb, DEFAULT_CACHE_DB, BASE_DIR),
         "model_path": Cache.validate_model_path(dmd, DEFAULT_MODEL_DIR),
         "headless": headless_normalized,
+        "driver_pool_size": Settings.normalize_pool_size(pool_size, DEFAULT_DRIVER_POOL_SIZE),
+        "fetch_backend": Settings.normalize_fetch_backend(backend, DEFAULT_FETCH_BACKEND),
         "theme": theme_normalized,
     }
     return normalized
 
 def apply_settings(settings):
-    global CACHE_EXPIRY_HOURS, CACHE_DB, MODEL_DIR, HEADLESS_MODE, THEME_PREFERENCE
+    global CACHE_EXPIRY_HOURS, CACHE_MAX_ENTRIES, CACHE_MAX_MB, CACHE_DB, MODEL_DIR, HEADLESS_MODE, DRIVER_POOL_SIZE, FETCH_BACKEND, THEME_PREFERENCE
     normalized = _normalize_settings(settings)
     CACHE_EXPIRY_HOURS = normalized["cache_expiry_hours"]
+    CACHE_MAX_ENTRIES = normalized["cache_max_entries"]
+    CACHE_MAX_MB = normalized["cache_max_mb"]
     CACHE_DB = normalized["cache_db_path"]
     MODEL_DIR = normalized["model_path"]
     HEADLESS_MODE = normalized["headless"]
+    DRIVER_POOL_SIZE = normalized["driver_pool_size"]
+    FETCH_BACKEND = normalized["fetch_backend"]
     THEME_PREFERENCE = normalized["theme"]
     return normalized
 
@@ -78,6 +112,7 @@ def persist_settings(settings):
     with open(Settings.settings_path(BASE_DIR), 'w') as f:
         json.dump(normalized, f, indent=4)
     DB.initialize_cache_db(CACHE_DB)
+    sweep_cache()
     return normalized
 
 def load_settings():
@@ -94,10 +129,17 @@ def load_settings():
 
     applied = apply_settings(file_settings)
     DB.initialize_cache_db(CACHE_DB)
+    sweep_cache()
     return applied
 
+def sweep_cache():
+    expired, evicted = DB.sweep_cache(CACHE_DB, CACHE_EXPIRY_HOURS, CACHE_MAX_ENTRIES, CACHE_MAX_MB)
+    if expired or evicted:
+        print(f"[INFO] Cache sweep removed {expired} expired and {evicted} evicted entries.")
+
 
 load_settings()
+DB.start_sweeper(sweep_cache, CACHE_SWEEP_INTERVAL_S)
 
 def _current_settings_snapshot(theme_override=None):
     return Settings.get_active_settings(
@@ -106,6 +148,10 @@ def _current_settings_snapshot(theme_override=None):
         MODEL_DIR,
         HEADLESS_MODE,
         theme_override or THEME_PREFERENCE,
+        CACHE_MAX_ENTRIES,
+        CACHE_MAX_MB,
+        DRIVER_POOL_SIZE,
+        FETCH_BACKEND,
     )
 
 def _format_model_metadata(path):
@@ -122,11 +168,13 @@ def _format_model_metadata(path):
             "modified": datetime.fromtimestamp(stats.st_mtime).strftime("%Y-%m-%d %H:%M:%S"),
         })
 
-        model_obj = joblib.load(path)
-        metadata.update({
-            "estimator": type(model_obj).__name__,
-            "estimator_module": getattr(model_obj, "__module__", ""),
-        })
+        # Only the sidecar is read; loading the model itself can take seconds
+        sidecar = ModelArtifact.read_sidecar(path)
+        if sidecar is None:
+            metadata["sidecar"] = "missing (retrain to generate it)"
+        else:
+            metadata.update(sidecar)
+            metadata["sidecar"] = "ok" if sidecar.get("size_bytes") == stats.st_size else "stale (model file changed)"
     except Exception as e:
         metadata["error"] = f"Failed to read model metadata: {e}"
 
@@ -137,12 +185,21 @@ def _model_metadata_text(metadata):
     if "error" in metadata:
         return f"Status: {metadata['error']}\nPath: {metadata.get('path', 'N/A')}"
 
+    metrics = metadata.get("metrics") or {}
+    accuracy = metrics.get("accuracy_mean", metrics.get("accuracy_before_update"))
+    watermark = metadata.get("watermark") or {}
     return "\n".join([
         f"Path: {metadata['path']}",
         f"Estimator: {metadata.get('estimator', 'Unknown')}",
         f"Module: {metadata.get('estimator_module', 'Unknown')}",
+        f"Trees: {metadata.get('n_estimators', 'Unknown')}",
+        f"Params: {metadata.get('params', 'Unknown')}",
+        f"Accuracy: {'Unknown' if accuracy is None else f'{accuracy:.3f}'}",
+        f"Trained: {metadata.get('trained_at', 'Unknown')} ({watermark.get('matches', '?')} matches)",
+        f"SHA-256: {metadata.get('sha256', 'Unknown')[:16]}",
         f"Size: {metadata.get('size_mb', '0')} MB",
         f"Last Modified: {metadata.get('modified', 'Unknown')}",
+        f"Sidecar: {metadata.get('sidecar', 'Unknown')}",
     ])
 
 
@@ -154,152 +211,226 @@ map_player_dict = Dictionary.map_player_dict
 map_team_dict = Dictionary.map_team_dict
 reverse_map_team_dict = {v: k for k, v in map_team_dict.items()}
 
+# --------------------------
+# MODEL
+# --------------------------
+model = None
+flat_model = None
+model_error = None
+model_path = None
+model_ready = threading.Event()
+_model_lock = threading.Lock()
+_model_generation = 0
+
+def load_model_async(path):
+    """Load the model on a background thread so the window opens straight away.
+
+    The memory-mapped flattened forest saved next to the model is used when
+    it's there; the pickle is then only loaded if a batch too large for it
+    comes along.
+    """
+    global _model_generation
+    _model_generation += 1
+    generation = _model_generation
+    model_ready.clear()
+
+    def load():
+        global model, flat_model, model_error, model_path
+        loaded = flat = None
+        try:
+            if not os.path.isfile(path):
+                raise FileNotFoundError(f"Model file not found at {path}")
+            start = time.perf_counter()
+            flat, error = ModelArtifact.load_flat(path), None
+            if flat is not None:
+                print(f"[INFO] Flattened forest mapped from {path} in {time.perf_counter() - start:.2f}s")
+            else:
+                loaded = ModelArtifact.load(path)
+                print(f"[INFO] Model loaded from {path} in {time.perf_counter() - start:.2f}s")
+                try:
+                    flat = FlatForest.compile(loaded)
+                except TypeError as e:
+                    print(f"[WARN] {e}; predicting with the model as is")
+        except Exception as e:
+            error = e
+            print(f"[ERROR] Failed to load model: {e}")
+        # A newer load (the model path changed meanwhile) wins
+        if generation == _model_generation:
+            with _model_lock:
+                model, flat_model, model_error, model_path = loaded, flat, error, path
+            model_ready.set()
+
+    threading.Thread(target=load, daemon=True).start()
+
+def get_model():
+    """Wait for the model to load; returns the flattened forest if the pickle hasn't been needed yet."""
+    if not model_ready.is_set() and Utils.status_cb:
+        Utils.status_cb("Waiting for the model to finish loading...", result_text, progress_var, "info")
+    model_ready.wait()
+    if model_error is not None:
+        raise model_error
+    return model if model is not None else flat_model
+
+def get_sklearn_model():
+    global model
+    get_model()
+    with _model_lock:
+        if model is None:
+            start = time.perf_counter()
+            model = ModelArtifact.load(model_path)
+            print(f"[INFO] Model loaded from {model_path} in {time.perf_counter() - start:.2f}s")
+        return model
+
+def predict_proba(features):
+    """Score a feature frame, through the flattened forest for the small batches the GUI sends."""
+    get_model()
+    if flat_model is not None and len(features) <= FLAT_FOREST_MAX_ROWS:
+        return flat_model.predict_proba(features.to_numpy())
+    return get_sklearn_model().predict_proba(features)
+
 # --------------------------
 # CHROME DRIVER
 # --------------------------
-driver = None
+driver_pool = None
+fetcher = None
 _driver_lock = threading.Lock()
+limiter = RateLimiter(FETCH_RATE, FETCH_BURST, jitter=0.3)
+page_memo = PageMemo(PAGE_MEMO_SIZE)
+
+def _setup_driver(driver):
+    Utils.status_cb("Starting driver...", result_text, progress_var, "good")
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": Dictionary.adblock_list})
 
 def start_driver():
-    global driver
+    global driver_pool
+    with _driver_lock:
+        if driver_pool is None:
+            driver_pool = DriverPool(DRIVER_POOL_SIZE, headless=HEADLESS_MODE, setup=_setup_driver)
+        return driver_pool
+
+def _on_challenge(url, attempt):
+    Utils.status_cb(f"Cloudflare challenge on {url} (attempt {attempt}), backing off...",
+                    result_text, progress_var, "warn")
+
+def get_fetcher():
+    global fetcher
     with _driver_lock:
-        if driver is None:
-            Utils.status_cb("Starting driver...", result_text, progress_var, "good")
-            driver = Driver.get_driver(headless=HEADLESS_MODE)
-            driver.execute_cdp_cmd("Network.enable", {})
-            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": Dictionary.adblock_list})
-        return driver
+        if fetcher is None:
+            http = HttpFetcher(COOKIE_FILE, pool_size=DRIVER_POOL_SIZE * 2) if FETCH_BACKEND in ("auto", "http") else None
+            fetcher = PageFetcher(FETCH_BACKEND, http=http, limiter=limiter, max_retries=MAX_CHALLENGE_RETRIES,
+                                  on_challenge=_on_challenge, archive=PageArchive(ARCHIVE_DIR))
+        return fetcher
 
 def stop_driver():
-    global driver
+    global driver_pool, fetcher
     with _driver_lock:
-        if driver is not None:
-            try:
-                Utils.status_cb("Stopping driver...", result_text, progress_var, "good")
-                driver.quit()
-            except Exception:
-                pass
-            driver = None
+        if fetcher is not None:
+            if fetcher.http is not None:
+                fetcher.http.close()
+            fetcher.archive.close()
+            fetcher = None
+        if driver_pool is not None:
+            if driver_pool.started:
+                Utils.status_cb("Stopping drivers...", result_text, progress_var, "good")
+            driver_pool.quit()
+            driver_pool = None
 
 atexit.register(stop_driver)
 
+def fetch_html(url):
+    return page_memo.get_or_fetch(url, lambda: _download_page(url))
+
+
 def fetch_page(url):
-    active_driver = start_driver()
-    active_driver.get(url)
-    html = active_driver.page_source
-    return BeautifulSoup(html, "html.parser")
+    html = fetch_html(url)
+    return None if html is None else PageParser.parse(html)
+
+
+def _browser_get(url):
+    # Chrome only starts the first time a page actually needs the browser
+    with start_driver().driver() as active_driver:
+        active_driver.get(url)
+        return active_driver.page_source
+
+
+def _download_page(url):
+    html = get_fetcher().fetch(url, _browser_get)
+    if html is None:
+        Utils.status_cb(f"No usable page for {url}", result_text, progress_var, "warn")
+    return html
 
 
 # --------------------------
 # SCRAPER FUNCTIONS
 # --------------------------
-def get_valve_points(url):
-    db_key = f"valve::{url}"
-    cached = DB.cache_get(db_key, CACHE_DB, CACHE_EXPIRY_HOURS)
-    if cached is not None:
-        return cached
-
+def get_ranking_snapshot(url):
+    # None marks a failed fetch, which is never cached
     html = fetch_page(url)
-    pts = HTMLUtils.get_team_line_expanded(html)
-    DB.cache_set(db_key, pts, CACHE_DB)
-    return pts
+    if html is None:
+        return None
+    ranking = HTMLUtils.get_ranking_points(html)
+    if not ranking:
+        Utils.status_cb(f"No valve ranking table found at {url}", result_text, progress_var, "warn")
+        return None
+    return ranking
 
 
 def get_winrate(url):
-    db_key = f"winrate::{url}"
-    cached = DB.cache_get(db_key, CACHE_DB, CACHE_EXPIRY_HOURS)
-    if cached is not None:
-        return cached
-
-    html = fetch_page(url)
+    html = fetch_html(url)
     if html is None:
         Utils.status_cb(f"Failed to fetch winrate page for {url}", result_text, progress_var, "warn")
         print(f"Failed to fetch winrate page for {url}")
-        DB.cache_set(db_key, 0, CACHE_DB)
         return 0
 
-    stats_nodes = html.find_all(class_="large-strong")
+    stats_nodes = PageParser.parse(html, PageParser.LARGE_STRONG).find_all(class_="large-strong")
     if len(stats_nodes) < 2:
         Utils.status_cb(f"Winrate stats not found for {url}", result_text, progress_var, "warn")
         print(f"Winrate stats not found for {url}")
-        DB.cache_set(db_key, 0, CACHE_DB)
         return 0
 
     stats = stats_nodes[1].text
     if " / " not in stats:
         Utils.status_cb(f"Unexpected winrate format for {url}", result_text, progress_var, "warn")
         print(f"Unexpected winrate format for {url}")
-        DB.cache_set(db_key, 0, CACHE_DB)
         return 0
 
     w, d, l = map(int, stats.split(" / "))
     winrate = 0 if (w + d + l) == 0 else round(w / (w + d + l) * 100, 1)
 
-    DB.cache_set(db_key, winrate, CACHE_DB)
     return winrate
 
 
-def get_map_winrate(url):
-    db_key = f"mapwin::{url}"
-    cached = DB.cache_get(db_key, CACHE_DB, CACHE_EXPIRY_HOURS)
-    if cached is not None:
-        return cached
-
+def get_team_map_winrates(url):
     html = fetch_page(url)
     if html is None:
-        Utils.status_cb(f"Failed to fetch map winrate page for {url}", result_text, progress_var, "warn")
-        print(f"Failed to fetch map winrate page for {url}")
-        DB.cache_set(db_key, 0, CACHE_DB)
-        return 0
+        Utils.status_cb(f"Failed to fetch map overview page for {url}", result_text, progress_var, "warn")
+        print(f"Failed to fetch map overview page for {url}")
+        return None
 
-    rows = html.find_all(class_='stats-row')
-    if len(rows) < 2:
+    winrates = HTMLUtils.get_team_map_winrates(html)
+    if not winrates:
         Utils.status_cb(f"Map stats not found for {url}", result_text, progress_var, "warn")
         print(f"Map stats not found for {url}")
-        DB.cache_set(db_key, 0, CACHE_DB)
-        return 0
+        return None
 
-    spans = rows[1].find_all('span')
-    if len(spans) < 2:
-        Utils.status_cb(f"Map winrate spans missing for {url}", result_text, progress_var, "warn")
-        print(f"Map winrate spans missing for {url}")
-        DB.cache_set(db_key, 0, CACHE_DB)
-        return 0
-
-    map_stats = spans[1].text
-    if " / " not in map_stats:
-        Utils.status_cb(f"Unexpected map winrate format for {url}", result_text, progress_var, "warn")
-        print(f"Unexpected map winrate format for {url}")
-        DB.cache_set(db_key, 0, CACHE_DB)
-        return 0
-
-    w, d, l = map(int, map_stats.split(" / "))
-    winrate = 0 if (w + d + l) == 0 else round(w / (w + d + l) * 100, 1)
-
-    DB.cache_set(db_key, winrate, CACHE_DB)
-    return winrate
+    return winrates
 
 
 def get_player_stats(name, player_id, date):
     key_date = date.strftime('%Y-%m-%d')
-    db_key = f"player::{player_id}::{key_date}"
-    cached = DB.cache_get(db_key, CACHE_DB, CACHE_EXPIRY_HOURS)
-    if cached is not None:
-        return cached
 
     url = f"https://www.hltv.org/stats/players/matches/{player_id}/{name}?startDate={(date - timedelta(days=90)).strftime('%Y-%m-%d')}&endDate={key_date}"
-    html = fetch_page(url)
+    html = fetch_html(url)
 
     if html is None:
         Utils.status_cb(f"Failed to fetch player page for {url}", result_text, progress_var, "warn")
         print(f"[WARN] Failed to fetch player page for {name} ({player_id}).")
-        DB.cache_set(db_key, [], CACHE_DB)
         return []
 
-    table = html.find(class_='stats-table')
+    table = PageParser.parse(html, PageParser.STATS_TABLE).find(class_='stats-table')
     if table is None:
         print(f"[ERROR] No player stats-table found for {name} ({player_id})")
-        DB.cache_set(db_key, [], CACHE_DB)
         return []
     matches = table.find_all("tr", class_=["group-1", "group-2"], limit=10)
 
@@ -330,125 +461,206 @@ def get_player_stats(name, player_id, date):
             "map": map_player_dict.get(map_name, map_name)
         })
 
-    DB.cache_set(db_key, stats, CACHE_DB)
     return stats
 
 
 def get_head_to_head_stats(url):
-    db_key = f"h2h::{url}"
-    cached = DB.cache_get(db_key, CACHE_DB, CACHE_EXPIRY_HOURS)
-    if cached is not None:
-        return cached
-
-    html = fetch_page(url)
-    item = html.find(class_='head-to-head')
+    html = fetch_html(url)
+    if html is None:
+        Utils.status_cb(f"Failed to fetch head to head for {url}", result_text, progress_var, "warn")
+        print(f"[WARN] Failed to fetch head to head for {url}")
+        return [0, 0]
+
+    item = PageParser.parse(html, PageParser.HEAD_TO_HEAD).find(class_='head-to-head')
+    if item is None:
+        Utils.status_cb(f"Head to head stats not found for {url}", result_text, progress_var, "warn")
+        print(f"[WARN] Head to head stats not found for {url}")
+        return [0, 0]
     stats = item.find_all(class_='bold')
     w1, ot, w2 = [int(s.text) for s in stats]
     result = [w1, w2]
-    DB.cache_set(db_key, result, CACHE_DB)
     return result
 
 
 def get_recent_matches(name, team_id, date):
     key_date = date.strftime('%Y-%m-%d')
-    db_key = f"recent::{team_id}::{key_date}::{name}"
-    cached = DB.cache_get(db_key, CACHE_DB, CACHE_EXPIRY_HOURS)
-    if cached is not None:
-        return cached
 
     url = f"https://www.hltv.org/stats/teams/matches/{team_id}/{name}?startDate={(date - timedelta(days=90)).strftime('%Y-%m-%d')}&endDate={key_date}"
-    html = fetch_page(url)
-    matches = html.find(class_='stats-table').find_all("tr", class_=["group-1", "group-2"], limit=10)
+    html = fetch_html(url)
+    if html is None:
+        Utils.status_cb(f"Failed to fetch recent matches page for {url}", result_text, progress_var, "warn")
+        print(f"[WARN] Failed to fetch recent matches for {name} ({team_id}).")
+        return []
+
+    table = PageParser.parse(html, PageParser.STATS_TABLE).find(class_='stats-table')
+    if table is None:
+        print(f"[ERROR] No recent matches stats-table found for {name} ({team_id})")
+        return []
+    matches = table.find_all("tr", class_=["group-1", "group-2"], limit=10)
     lst = [m.find(class_=["match-lost", "match-won"]).text.strip() for m in matches]
     lst.reverse()
 
-    DB.cache_set(db_key, lst, CACHE_DB)
     return lst
 
 
 # --------------------------
 # MAIN LOGIC
 # --------------------------
-def prepare_match_all_maps(url):
-    db_key = f"match::{url}"
-    cached = DB.cache_get(db_key, CACHE_DB, CACHE_EXPIRY_HOURS)
-    if cached is not None:
-        if Utils.status_cb:
-            Utils.status_cb("Loaded match data from cache.", result_text, progress_var, level="good")
-        return cached
-
-    if Utils.status_cb:
-        Utils.status_cb("Loading match page...", result_text, progress_var, level="good")
-
+def load_match_page(url):
+    """Fetch the match page and pull out everything the stat fetches depend on."""
     html = fetch_page(url)
+    if html is None:
+        # Nothing else can be planned without the match page, so fail the prediction outright
+        Utils.status_cb(f"Failed to fetch match page {url}", result_text, progress_var, "error")
+        raise RuntimeError(f"Couldn't fetch match page {url}")
     unix = int(html.find(class_='date')['data-unix']) / 1000
     date = datetime.fromtimestamp(unix) - timedelta(days=1)
 
-    team1 = html.find(class_='team1-gradient')
-    team1_name = team1.find('a')['href'].split('/')[-1]
-    team1_id = team1.find('a')['href'].split('/')[-2]
+    teams = []
+    for gradient in ('team1-gradient', 'team2-gradient'):
+        team = html.find(class_=gradient)
+        teams.append((team.find('a')['href'].split('/')[-2], team.find('a')['href'].split('/')[-1]))
 
-    team2 = html.find(class_='team2-gradient')
-    team2_name = team2.find('a')['href'].split('/')[-1]
-    team2_id = team2.find('a')['href'].split('/')[-2]
+    lineups = []
+    for lineup in html.find_all(class_='lineup')[:2]:
+        players = lineup.find(class_='players').find_all('tr')[1].find_all(class_='player-compare')
+        lineups.append([(player['data-player-id'], player.text.strip()) for player in players])
 
-    # Fetch cached stats
-    if Utils.status_cb:
-        Utils.status_cb("Fetching team rankings and recent performance...", result_text, progress_var, level="good")
+    return {"url": url, "date": date, "teams": teams, "lineups": lineups}
+
+
+def fill_map_winrates(map_keys):
+    """``then`` callback that spreads a team's map overview over its per-map ``mapwin::`` keys.
+
+    A failed overview (``None``) fills every key with ``None``, so none of them is cached.
+    """
+    def fill(graph, winrates):
+        for map_name, key in map_keys.items():
+            graph.add_result(key, None if winrates is None else winrates.get(map_name, 0), cached=False)
+    return fill
+
+
+def plan_match_stats(graph, match_info):
+    """Add one task per stat the match needs; cache hits are filled in without running."""
+    url = match_info["url"]
+    date = match_info["date"]
+    key_date = date.strftime('%Y-%m-%d')
+    date_range = f"?startDate={(date - timedelta(days=90)).strftime('%Y-%m-%d')}&endDate={key_date}"
 
     #value = 1
     #if date.day - 1 == 0:
     #    value = 1
 
-    team1_valve_pts = get_valve_points(
-        f"https://www.hltv.org/valve-ranking/teams/{date.year}/{month_dict[date.month]}/{date.day - 1}?teamId={team1_id}")
-    team2_valve_pts = get_valve_points(
-        f"https://www.hltv.org/valve-ranking/teams/{date.year}/{month_dict[date.month]}/{date.day - 1}?teamId={team2_id}")
-    team1_winrate = get_winrate(
-        f'https://www.hltv.org/stats/teams/{team1_id}/{team1_name}?startDate={(date - timedelta(days=90)).strftime("%Y-%m-%d")}&endDate={date.strftime("%Y-%m-%d")}')
-    team2_winrate = get_winrate(
-        f'https://www.hltv.org/stats/teams/{team2_id}/{team2_name}?startDate={(date - timedelta(days=90)).strftime("%Y-%m-%d")}&endDate={date.strftime("%Y-%m-%d")}')
-    head_to_head_stats = get_head_to_head_stats(url)
-    team1_recent_matches = get_recent_matches(team1_name, team1_id, date)
-    team2_recent_matches = get_recent_matches(team2_name, team2_id, date)
-
-    # Players
+    # One snapshot of the whole ranking table per date serves every team's valve points
+    ranking_url = f"https://www.hltv.org/valve-ranking/teams/{date.year}/{month_dict[date.month]}/{date.day - 1}"
+    plan = {f"ranking::{ranking_url}": (get_ranking_snapshot, (ranking_url,))}
+    keys = {"ranking": f"ranking::{ranking_url}", "winrate": [], "recent": [], "players": [], "map_winrate": {}}
+    for team_id, team_name in match_info["teams"]:
+        winrate_url = f"https://www.hltv.org/stats/teams/{team_id}/{team_name}{date_range}"
+        plan[f"winrate::{winrate_url}"] = (get_winrate, (winrate_url,))
+        plan[f"recent::{team_id}::{key_date}::{team_name}"] = (get_recent_matches, (team_name, team_id, date))
+        keys["winrate"].append(f"winrate::{winrate_url}")
+        keys["recent"].append(f"recent::{team_id}::{key_date}::{team_name}")
+
+    plan[f"h2h::{url}"] = (get_head_to_head_stats, (url,))
+    keys["h2h"] = f"h2h::{url}"
+
+    for lineup in match_info["lineups"]:
+        lineup_keys = []
+        for pid, pname in lineup:
+            plan[f"player::{pid}::{key_date}"] = (get_player_stats, (pname, pid, date))
+            lineup_keys.append((pname, f"player::{pid}::{key_date}"))
+        keys["players"].append(lineup_keys)
+
+    # Per-map winrates are still cached per map, but one overview page per team fills all of them
+    team_map_keys = []
+    for team_id, team_name in match_info["teams"]:
+        map_keys = {}
+        for map_name, map_code in map_team_dict.items():
+            map_url = f"https://www.hltv.org/stats/teams/map/{map_code}/{team_id}/{team_name}{date_range}"
+            map_keys[map_name] = f"mapwin::{map_url}"
+            keys["map_winrate"].setdefault(map_name, []).append(map_keys[map_name])
+        overview_url = f"https://www.hltv.org/stats/teams/maps/{team_id}/{team_name}{date_range}"
+        team_map_keys.append((overview_url, map_keys))
+
+    map_keys_all = [key for _, map_keys in team_map_keys for key in map_keys.values()]
+    cached = DB.cache_get_many([*plan.keys(), *map_keys_all], CACHE_DB, CACHE_EXPIRY_HOURS)
+    root = f"page::{url}"
+    for key, (fetch_fn, args) in plan.items():
+        if key in cached:
+            graph.add_result(key, cached[key])
+        else:
+            graph.add(key, fetch_fn, args, deps=(root,))
+
+    pages = sum(1 for key in plan if key not in cached)
+    for overview_url, map_keys in team_map_keys:
+        if all(key in cached for key in map_keys.values()):
+            for key in map_keys.values():
+                graph.add_result(key, cached[key])
+        else:
+            graph.add(f"maps::{overview_url}", get_team_map_winrates, (overview_url,), deps=(root,),
+                      then=fill_map_winrates(map_keys))
+            pages += 1
+
     if Utils.status_cb:
-        Utils.status_cb("Fetching player statistics...", result_text, progress_var, level="good")
-
-    team1_players = html.find_all(class_='lineup')[0].find(class_='players').find_all('tr')[1].find_all(
-        class_='player-compare')
-    team2_players = html.find_all(class_='lineup')[1].find(class_='players').find_all('tr')[1].find_all(
-        class_='player-compare')
-
-    team1_players_stats = []
-    for player in team1_players:
-        pid = player['data-player-id']
-        pname = player.text.strip()
-        stats = get_player_stats(pname, pid, date)
-        team1_players_stats.append({"name": pname, "stats": stats})
-
-    team2_players_stats = []
-    for player in team2_players:
-        pid = player['data-player-id']
-        pname = player.text.strip()
-        stats = get_player_stats(pname, pid, date)
-        team2_players_stats.append({"name": pname, "stats": stats})
+        Utils.status_cb(f"{len(cached)} stats cached, fetching {pages} pages...",
+                        result_text, progress_var, level="good")
+    match_info["keys"] = keys
+
 
+def gather_match_records(url):
+    """Fetch every stat for ``url`` and return ``(teams, date, records, complete)`` with one record per map.
+
+    ``complete`` is False if any fetch failed (returned ``None``); failed stats
+    are left out of the cache and fall back to defaults in the records.
+    """
     if Utils.status_cb:
-        Utils.status_cb("Fetching map stats and running predictions...", result_text, progress_var,  level="good")
+        Utils.status_cb("Loading match page...", result_text, progress_var, level="good")
+
+    # The match page is the only real prerequisite; every stat fetch hangs off it.
+    # Pages parsed during this prediction (e.g. the match page for head to head) are reused.
+    page_memo.clear()
+    graph = TaskGraph()
+    root = graph.add(f"page::{url}", load_match_page, (url,), then=plan_match_stats)
+    graph.run(DRIVER_POOL_SIZE)
+
+    # Overview pages are only cached through the per-map keys they fill
+    fetched = {key: value for key, value in graph.fetched().items() if not key.startswith("maps::")}
+    fetched.pop(root)
+    failed = [key for key, value in fetched.items() if value is None]
+    DB.cache_set_many({key: value for key, value in fetched.items() if value is not None}, CACHE_DB)
+    if failed and Utils.status_cb:
+        Utils.status_cb(f"{len(failed)} stats couldn't be fetched and won't be cached; using defaults.",
+                        result_text, progress_var, "warn")
+
+    summary = graph.summary()
+    if Utils.status_cb:
+        Utils.status_cb(
+            f"Fetched {summary['fetched']} pages in {summary['wall_time']:.1f}s "
+            f"(critical path {summary['critical_path_time']:.1f}s, serial {summary['serial_time']:.1f}s, "
+            f"{page_memo.avoided} duplicate page loads avoided). {get_fetcher().stats.summary()}.",
+            result_text, progress_var, level="info")
+
+    match_info = graph.result(root)
+    keys = match_info["keys"]
+    date = match_info["date"]
+    (team1_id, team1_name), (team2_id, team2_name) = match_info["teams"]
+    ranking = graph.result(keys["ranking"]) or {}
+    team1_valve_pts = HTMLUtils.points_for_team(ranking, team1_id)
+    team2_valve_pts = HTMLUtils.points_for_team(ranking, team2_id)
+    team1_winrate, team2_winrate = (graph.result(key) for key in keys["winrate"])
+    team1_recent_matches, team2_recent_matches = (graph.result(key) for key in keys["recent"])
+    head_to_head_stats = graph.result(keys["h2h"])
+    team1_players_stats, team2_players_stats = (
+        [{"name": pname, "stats": graph.result(key)} for pname, key in lineup_keys]
+        for lineup_keys in keys["players"]
+    )
 
-    predictions = []
+    records = []
     for map_name in map_team_dict.keys():
-        if Utils.status_cb:
-            Utils.status_cb(f"Processing map {map_name}...", result_text, progress_var)
-        map_code = map_team_dict[map_name]
-        team1_map_winrate = get_map_winrate(
-            f'https://www.hltv.org/stats/teams/map/{map_code}/{team1_id}/{team1_name}?startDate={(date - timedelta(days=90)).strftime("%Y-%m-%d")}&endDate={date.strftime("%Y-%m-%d")}')
-        team2_map_winrate = get_map_winrate(
-            f'https://www.hltv.org/stats/teams/map/{map_code}/{team2_id}/{team2_name}?startDate={(date - timedelta(days=90)).strftime("%Y-%m-%d")}&endDate={date.strftime("%Y-%m-%d")}')
-
-        match_data = {
+        team1_map_winrate, team2_map_winrate = (graph.result(key) or 0 for key in keys["map_winrate"][map_name])
+
+        records.append({
             "date": date.strftime('%Y-%m-%d'),
             "map": map_name,
             "team1": {
@@ -473,72 +685,100 @@ def prepare_match_all_maps(url):
                 "team2_winrate": 0 if head_to_head_stats[0] + head_to_head_stats[1] == 0 else round(
                     head_to_head_stats[1] / (head_to_head_stats[0] + head_to_head_stats[1]) * 100, 1)
             }
-        }
-
-        features = process_match(match_data)
-        probabilities = model.predict_proba(pd.DataFrame([features]))[0]
-        t1p = probabilities[1] * 100
-        t2p = probabilities[0] * 100
-        winner = team1_name if t1p > t2p else team2_name
-        predictions.append({"map": map_name, "predicted_winner": winner, "team1_prob": t1p, "team2_prob": t2p})
-
-    match_code = url.split('/')[-2]
-    output = {"match_code": match_code, "date": date.strftime('%Y-%m-%d'), "teams": [team1_name, team2_name],
-              "predictions": predictions}
-
-    if Utils.status_cb:
-        Utils.status_cb("Caching match data and finishing...", result_text, progress_var, level="good")
-
-    DB.cache_set(db_key, output, CACHE_DB)
-    return output
+        })
 
+    return (team1_name, team2_name), date, records, not failed
 
-def average_player_stats(team):
-    ratings = []
-    kds = []
 
-    for player in team.get('players', []):
-        for stat in player.get('stats', []):
-            rating = stat.get('rating2.0')
-            kd = stat.get('kd')
+def predict_matches(urls):
+    """Predict every map of every match in ``urls`` with a single ``predict_proba`` call.
 
-            if rating is not None:
-                ratings.append(rating)
-            if kd is not None:
-                kds.append(kd)
+    Matches already in the cache are returned as is; the rest are fetched one
+    after another, stacked into one (7 x matches) by F matrix and scored together.
+    """
+    outputs = {}
+    pending = []
+    for url in dict.fromkeys(urls):
+        cached = DB.cache_get(f"match::{url}", CACHE_DB, CACHE_EXPIRY_HOURS)
+        if cached is not None:
+            if Utils.status_cb:
+                Utils.status_cb(f"Loaded {url} from cache.", result_text, progress_var, level="good")
+            outputs[url] = cached
+        else:
+            pending.append((url, *gather_match_records(url)))
 
-    if not ratings or not kds:
+    if pending:
         if Utils.status_cb:
-            Utils.status_cb(
-                f"Player stats unavailable for {team.get('name', 'team')}; using defaults.",
-                result_text,
-                progress_var,
-                "warn",
-            )
-        return 0.0, 0.0
-
-    avg_rating = np.mean(ratings)
-    avg_kd = np.mean(kds)
-    return avg_rating, avg_kd
-
-
-def process_match(match):
-    f = {'team1_valve_points': match['team1']['valve_points'], 'team2_valve_points': match['team2']['valve_points'],
-         'team1_win_rate': match['team1']['win_rate'], 'team2_win_rate': match['team2']['win_rate'],
-         'team1_map_win_rate': match['team1']['map_win_rate'], 'team2_map_win_rate': match['team2']['map_win_rate'],
-         'team1_h2h_winrate': match['head_to_head']['team1_winrate'],
-         'team2_h2h_winrate': match['head_to_head']['team2_winrate'],
-         'team1_recent_wins': sum(1 for r in match['team1']['recent_matches'] if r == 'W'),
-         'team2_recent_wins': sum(1 for r in match['team2']['recent_matches'] if r == 'W'),
-         'team1_avg_rating': (average_player_stats(match['team1']))[0],
-         'team1_avg_kd': (average_player_stats(match['team1']))[1],
-         'team2_avg_rating': (average_player_stats(match['team2']))[0],
-         'team2_avg_kd': (average_player_stats(match['team2']))[1]}
-    return f
+            Utils.status_cb("Running predictions...", result_text, progress_var,  level="good")
+
+        records = [record for _, _, _, match_records, _ in pending for record in match_records]
+        features = Features.build_feature_frame(records)
+        get_model()
+        start = time.perf_counter()
+        probabilities = predict_proba(features)
+        elapsed = time.perf_counter() - start
+        if Utils.status_cb:
+            Utils.status_cb(f"Scored {len(records)} maps of {len(pending)} match(es) in one call: "
+                            f"{elapsed * 1000:.1f} ms ({elapsed * 1000 / len(records):.2f} ms per map).",
+                            result_text, progress_var, level="info")
+
+        row = 0
+        for url, (team1_name, team2_name), date, match_records, complete in pending:
+            rows = slice(row, row + len(match_records))
+            row += len(match_records)
+            if Utils.status_cb and not features.iloc[rows][['team1_avg_rating', 'team2_avg_rating']].to_numpy().all():
+                Utils.status_cb(f"Player stats unavailable for {team1_name} vs {team2_name}; using defaults.",
+                                result_text, progress_var, "warn")
+
+            predictions = []
+            for record, (t2p, t1p) in zip(match_records, probabilities[rows] * 100):
+                winner = team1_name if t1p > t2p else team2_name
+                predictions.append({"map": record["map"], "predicted_winner": winner,
+                                    "team1_prob": float(t1p), "team2_prob": float(t2p)})
+
+            match_code = url.split('/')[-2]
+            outputs[url] = {"match_code": match_code, "date": date.strftime('%Y-%m-%d'),
+                            "teams": [team1_name, team2_name], "predictions": predictions}
+            # A prediction built on defaults for failed fetches is shown but not cached
+            if complete:
+                DB.cache_set(f"match::{url}", outputs[url], CACHE_DB)
+
+    return [outputs[url] for url in urls]
+
+
+def show_match_results(match_results):
+    team1, team2 = match_results['teams']
+    result_text.insert(tk.END, f"Match: {team1} vs {team2} on {match_results['date']}\n")
+    avg_team1 = np.mean([p['team1_prob'] for p in match_results['predictions']])
+    avg_team2 = np.mean([p['team2_prob'] for p in match_results['predictions']])
+    overall_winner = team1 if avg_team1 > avg_team2 else team2
+    result_text.insert(tk.END, f"Overall Winner Prediction: {overall_winner} ({avg_team1:.1f}% vs {avg_team2:.1f}%)\n\n")
+
+    # Calculate column widths dynamically
+    winner_col_width = max(len('Predicted Winner'), len(team1), len(team2))
+    prob_col_width_team1 = len(team1 + ' Prob')
+    prob_col_width_team2 = len(team2 + ' Prob')
+
+    # Create header
+    header = f"{'Map':<10} | {'Predicted Winner':<{winner_col_width}} | {team1 + ' Prob':<{prob_col_width_team1}} | {team2 + ' Prob':<{prob_col_width_team2}}"
+    separator = "-" * (10 + 3 + winner_col_width + 3 + prob_col_width_team1 + 3 + prob_col_width_team2)
+    result_text.insert(tk.END, header + "\n")
+    result_text.insert(tk.END, separator + "\n")
+
+    # Insert predictions
+    for pred in match_results['predictions']:
+        map_name = pred['map'].ljust(10)
+        winner = pred['predicted_winner'].ljust(winner_col_width)
+        team1_prob = f"{pred['team1_prob']:.2f}%".ljust(prob_col_width_team1)
+        team2_prob = f"{pred['team2_prob']:.2f}%".ljust(prob_col_width_team2)
+        result_text.insert(tk.END, f"{map_name} | {winner} | {team1_prob} | {team2_prob}\n")
+    result_text.insert(tk.END, "\n")
+
 
 def predict_all_maps():
-    url = url_entry.get()
-    if not url:
+    # Several match URLs (separated by spaces or commas) are queued and scored in one batch
+    urls = url_entry.get().replace(",", " ").split()
+    if not urls:
         result_text.insert(tk.END, "Please enter a URL.\n")
         return
     result_text.delete(1.0, tk.END)  # Clear previous results
@@ -548,39 +788,17 @@ def predict_all_maps():
     progressbar.start(10)
 
     try:
-        match_results = prepare_match_all_maps(url)
-        team1, team2 = match_results['teams']
-        result_text.insert(tk.END, f"Match: {team1} vs {team2} on {match_results['date']}\n")
-        avg_team1 = np.mean([p['team1_prob'] for p in match_results['predictions']])
-        avg_team2 = np.mean([p['team2_prob'] for p in match_results['predictions']])
-        overall_winner = team1 if avg_team1 > avg_team2 else team2
-        result_text.insert(tk.END, f"Overall Winner Prediction: {overall_winner} ({avg_team1:.1f}% vs {avg_team2:.1f}%)\n\n")
-
-        # Calculate column widths dynamically
-        winner_col_width = max(len('Predicted Winner'), len(team1), len(team2))
-        prob_col_width_team1 = len(team1 + ' Prob')
-        prob_col_width_team2 = len(team2 + ' Prob')
-
-        # Create header
-        header = f"{'Map':<10} | {'Predicted Winner':<{winner_col_width}} | {team1 + ' Prob':<{prob_col_width_team1}} | {team2 + ' Prob':<{prob_col_width_team2}}"
-        separator = "-" * (10 + 3 + winner_col_width + 3 + prob_col_width_team1 + 3 + prob_col_width_team2)
-        result_text.insert(tk.END, header + "\n")
-        result_text.insert(tk.END, separator + "\n")
-
-        # Insert predictions
-        for pred in match_results['predictions']:
-            map_name = pred['map'].ljust(10)
-            winner = pred['predicted_winner'].ljust(winner_col_width)
-            team1_prob = f"{pred['team1_prob']:.2f}%".ljust(prob_col_width_team1)
-            team2_prob = f"{pred['team2_prob']:.2f}%".ljust(prob_col_width_team2)
-            result_text.insert(tk.END, f"{map_name} | {winner} | {team1_prob} | {team2_prob}\n")
+        all_results = predict_matches(urls)
+        for match_results in all_results:
+            show_match_results(match_results)
 
         progressbar.stop()
         progressbar.grid_remove()
         progress_var.set("Done")
         save_button.config(state=tk.NORMAL)
         global current_results
-        current_results = match_results
+        # Save and the charts work on the last match of the batch
+        current_results = all_results[-1]
     except Exception as e:
         progressbar.stop()
         progressbar.grid_remove()
@@ -692,7 +910,7 @@ if os.environ.get("HLTV_SKIP_GUI") != "1":
     def open_settings_window():
         win = tk.Toplevel(root)
         win.title("Settings")
-        win.geometry("430x620")
+        win.geometry("430x950")
 
         settings = _current_settings_snapshot(theme_var.get())
 
@@ -703,6 +921,15 @@ if os.environ.get("HLTV_SKIP_GUI") != "1":
         expiry_var = tk.StringVar(value=str(settings.get("cache_expiry_hours", CACHE_EXPIRY_HOURS)))
         tk.Entry(win, textvariable=expiry_var).pack()
 
+        # Cache Size Limits
+        tk.Label(win, text="Cache Max Entries (0 = unlimited):").pack()
+        max_entries_var = tk.StringVar(value=str(settings.get("cache_max_entries", CACHE_MAX_ENTRIES)))
+        tk.Entry(win, textvariable=max_entries_var).pack()
+
+        tk.Label(win, text="Cache Max Size MB (0 = unlimited):").pack()
+        max_mb_var = tk.StringVar(value=str(settings.get("cache_max_mb", CACHE_MAX_MB)))
+        tk.Entry(win, textvariable=max_mb_var).pack()
+
         # Cache Directory
         tk.Label(win, text="Cache DB Path:").pack()
         cache_var = tk.StringVar(value=settings.get("cache_db_path", CACHE_DB))
@@ -721,6 +948,21 @@ if os.environ.get("HLTV_SKIP_GUI") != "1":
         headless_var = tk.BooleanVar(value=settings.get("headless", HEADLESS_MODE))
         ttk.Checkbutton(win, text="Headless Mode", variable=headless_var).pack(pady=5)
 
+        # Driver Pool
+        tk.Label(win, text="Parallel Browser Drivers:").pack()
+        pool_size_var = tk.StringVar(value=str(settings.get("driver_pool_size", DRIVER_POOL_SIZE)))
+        tk.Entry(win, textvariable=pool_size_var).pack()
+
+        # Fetch Backend
+        tk.Label(win, text="Fetch Backend:").pack(pady=(10, 2))
+        backend_frame = ttk.Frame(win)
+        backend_frame.pack(pady=2)
+        backend_choice = tk.StringVar(value=settings.get("fetch_backend", FETCH_BACKEND))
+        ttk.Radiobutton(backend_frame, text="Auto", value="auto", variable=backend_choice).pack(side="left", padx=5)
+        ttk.Radiobutton(backend_frame, text="HTTP", value="http", variable=backend_choice).pack(side="left", padx=5)
+        ttk.Radiobutton(backend_frame, text="Browser", value="browser", variable=backend_choice).pack(side="left", padx=5)
+        ttk.Radiobutton(backend_frame, text="Archive", value="archive", variable=backend_choice).pack(side="left", padx=5)
+
         # Theme Preference
         tk.Label(win, text="Theme:").pack(pady=(10, 2))
         theme_frame = ttk.Frame(win)
@@ -779,16 +1021,27 @@ if os.environ.get("HLTV_SKIP_GUI") != "1":
         def save_settings():
             new_settings = {
                 "cache_expiry_hours": expiry_var.get(),
+                "cache_max_entries": max_entries_var.get(),
+                "cache_max_mb": max_mb_var.get(),
                 "cache_db_path": cache_var.get(),
                 "model_path": model_var.get(),
                 "headless": headless_var.get(),
+                "driver_pool_size": pool_size_var.get(),
+                "fetch_backend": backend_choice.get(),
                 "theme": theme_choice.get(),
             }
+            previous_model = MODEL_DIR
             normalized = persist_settings(new_settings)
+            if normalized["model_path"] != previous_model:
+                load_model_async(normalized["model_path"])
             expiry_var.set(str(normalized["cache_expiry_hours"]))
+            max_entries_var.set(str(normalized["cache_max_entries"]))
+            max_mb_var.set(str(normalized["cache_max_mb"]))
             cache_var.set(normalized["cache_db_path"])
             model_var.set(normalized["model_path"])
             headless_var.set(normalized["headless"])
+            pool_size_var.set(str(normalized["driver_pool_size"]))
+            backend_choice.set(normalized["fetch_backend"])
             theme_choice.set(normalized["theme"])
             theme_var.set(normalized["theme"])
             apply_theme(normalized["theme"])
@@ -860,7 +1113,7 @@ if os.environ.get("HLTV_SKIP_GUI") != "1":
         for widget in graph_frame.winfo_children():
             widget.destroy()
 
-    url_label = tk.Label(root, text="Match URL:")
+    url_label = tk.Label(root, text="Match URL(s):")
     url_label.pack()
 
     url_entry = tk.Entry(root, width=50)
@@ -933,12 +1186,7 @@ if os.environ.get("HLTV_SKIP_GUI") != "1":
 
     root.protocol("WM_DELETE_WINDOW", on_closing)
 
-    def load_model_file():
-        if not os.path.isfile(MODEL_DIR):
-            raise FileNotFoundError(f"Model file not found at {MODEL_DIR}")
-        return joblib.load(MODEL_DIR)
-
-    # Load the model
-    model = load_model_file()
+    # Load the model in the background; the first prediction waits for it if needed
+    load_model_async(MODEL_DIR)
 
     root.mainloop()
\ No newline at end of file
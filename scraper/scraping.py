@@ -1,13 +1,20 @@
 import argparse
+import os
 import time
 import logging
-import json
-import random
-from bs4 import BeautifulSoup
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from multiprocessing import Manager
 from datetime import datetime, timedelta
 
+from utils.archive import PageArchive
 from utils.dictionary import Dictionary
-from utils.driver import Driver, HTMLUtils
+from utils.driver import Driver, DriverPool, HTMLUtils
+from utils.fetch import HttpFetcher, PageFetcher, PageMemo
+from utils.memo import SessionMemo
+from utils.parsing import PageParser
+from utils.ratelimit import RateLimiter
+from utils.storage import MatchStore, ProcessedMatches
 
 # Configure logging
 logging.basicConfig(filename='scraper.log', level=logging.INFO, 
@@ -22,8 +29,38 @@ reverse_map_team_dict = {v: k for k, v in map_team_dict.items()}
 # Date range for filtering
 START_DATE = datetime(2025, 10, 1)
 END_DATE = datetime(2025, 12, 6)
+WINDOW = (START_DATE.strftime('%Y-%m-%d'), END_DATE.strftime('%Y-%m-%d'))
 
-request_count = 0
+# Global request budget shared by every worker (replaces the fixed 2-5 s sleeps)
+DEFAULT_RATE = 0.4  # requests per second
+DEFAULT_BURST = 3
+MAX_CHALLENGE_RETRIES = 3
+
+limiter = RateLimiter(DEFAULT_RATE, DEFAULT_BURST, jitter=0.5)
+
+# Team/player sub-fetches only depend on the entity and WINDOW, so reuse them across matches
+memo = SessionMemo()
+
+# Page HTML for the current run; several maps of one series share the same match page
+PAGE_MEMO_SIZE = 16
+page_memo = PageMemo(PAGE_MEMO_SIZE)
+
+DATA_FILE = "../data/hltv_data.jsonl"
+LEGACY_DATA_FILE = "../data/hltv_data.json"
+PROCESSED_DB = "../data/processed_matches.db"
+LEGACY_PROCESSED_FILE = "../data/processed_matches.json"
+COOKIE_FILE = "../config/cookies.json"
+
+# "auto" tries plain HTTP first and only falls back to the browser on challenge pages
+DEFAULT_BACKEND = "auto"
+
+# Every fetched page is archived so extraction changes can be replayed with --backend archive
+ARCHIVE_DIR = "../data/pages"
+REBUILD_DATA_FILE = "../data/hltv_data.rebuilt.jsonl"
+REBUILD_PROCESSED_DB = "../data/rebuild_processed.db"
+
+# Set in worker processes so appends to DATA_FILE never interleave
+_write_lock = None
 
 def add_date_params(url):
     """Safely append start/end date params whether or not the URL already has ?"""
@@ -35,129 +72,136 @@ def add_date_params(url):
     )
 
 
+def fetch_html(url, driver):
+    return page_memo.get_or_fetch(url, lambda: _download_page(url, driver))
+
 def fetch_page(url, driver):
-    global request_count
-    request_count += 1
-    
-    # Pause for 2 minutes every 300 requests
-    if request_count % 300 == 0:
-        logging.info(f"[INFO] Pausing for 2 minutes after {request_count} requests")
-        print(f"[INFO] Pausing for 2 minutes after {request_count} requests")
-        time.sleep(120)
-    
-    time.sleep(random.uniform(2, 5))  # Random delay
+    html = fetch_html(url, driver)
+    return None if html is None else PageParser.parse(html)
+
+def _browser_get(driver):
+    # ``driver`` is a one-driver DriverPool, so Chrome only starts the first time a page needs it
+    def get(url):
+        with driver.driver() as active_driver:
+            active_driver.get(url)
+            return active_driver.page_source
+    return get
+
+def _on_challenge(url, attempt):
+    logging.warning(f"[WARN] Cloudflare challenge on {url} (attempt {attempt}), backing off")
+    print(f"[WARN] Cloudflare challenge on {url} (attempt {attempt}), backing off")
+
+# Replaced by configure_fetcher() once the run's backend and rate limiter are known
+fetcher = PageFetcher("browser", limiter=limiter, max_retries=MAX_CHALLENGE_RETRIES, on_challenge=_on_challenge)
+
+def _download_page(url, driver):
     try:
-        driver.get(url)
-        html = driver.page_source
-        logging.info("[INFO] Fetched page source")
-        print("[INFO] Fetched page source")
-        return BeautifulSoup(html, "html.parser")
+        html = fetcher.fetch(url, _browser_get(driver))
     except Exception as e:
         logging.error(f"[ERROR] Error fetching {url}: {e}")
         return None
 
-def load_processed_matches():
-    try:
-        with open('../data/processed_matches.json', 'r') as f:
-            logging.info("[INFO] Loaded processed_matches.json")
-            print("[INFO] Loaded processed_matches.json")
-            return json.load(f)
-    except FileNotFoundError:
-        logging.info("[WARN] No processed_matches.json")
-        print("[WARN] No processed_matches.json")
-        return []
-
-def save_processed_matches(matches):
-    with open('../data/processed_matches.json', 'w') as f:
-        json.dump(matches, f, indent=4)
-        logging.info("[INFO] Saved processed_matches.json")
-        print("[INFO] Saved processed_matches.json")
+    if html is None:
+        logging.error(f"[ERROR] No usable page after {MAX_CHALLENGE_RETRIES} attempts: {url}")
+        return None
+    logging.info("[INFO] Fetched page source")
+    print("[INFO] Fetched page source")
+    return html
 
-def match_exists(match_url, processed_matches):
-    logging.info("[INFO] Match exists")
-    print("[INFO] Match exists")
-    return match_url in processed_matches
+def load_processed_matches():
+    processed_matches = ProcessedMatches(PROCESSED_DB, legacy_path=LEGACY_PROCESSED_FILE)
+    logging.info(f"[INFO] Loaded {len(processed_matches)} processed matches")
+    print(f"[INFO] Loaded {len(processed_matches)} processed matches")
+    return processed_matches
 
 def save_match_data(match_data):
-    try:
-        with open("../data/hltv_data.json", "r") as f:
-            existing_data = json.load(f)
-            if not isinstance(existing_data, list):
-                existing_data = []
-    except FileNotFoundError:
-        existing_data = []
+    with _write_lock or nullcontext():
+        MatchStore.append(DATA_FILE, match_data)
+
+def ranking_url(date):
+    return f"https://www.hltv.org/valve-ranking/teams/{date.year}/{month_dict[date.month]}/{date.day}"
 
-    existing_data.append(match_data)
-    with open("../data/hltv_data.json", "w") as f:
-        json.dump(existing_data, f, indent=4)
+def ranking_memo_key(date):
+    return SessionMemo.key("ranking", date.strftime('%Y-%m-%d'))
 
-def get_valve_points(url, name, driver):
-    logging.info(f"[INFO] Fetching valve points for: {name}")
-    print(f"[INFO] Fetching valve points for: {name}")
+def get_ranking_snapshot(url, driver):
+    logging.info(f"[INFO] Fetching valve ranking: {url}")
+    print(f"[INFO] Fetching valve ranking: {url}")
 
     html = fetch_page(url, driver)
     if html is None:
         logging.error(f"[ERROR] Couldn't fetch page: {url}")
         print(f"[ERROR] Couldn't fetch page: {url}")
-        return 0
-    pts = HTMLUtils.get_team_line_expanded(html)
-    logging.info(f"[INFO] Fetched valve points for: {name} ({pts} points)")
-    print(f"[INFO] Fetched valve points for: {name} ({pts} points)")
+        return None
+    ranking = HTMLUtils.get_ranking_points(html)
+    if not ranking:
+        logging.error(f"[ERROR] No valve ranking table found at: {url}")
+        print(f"[ERROR] No valve ranking table found at: {url}")
+        return None
+    logging.info(f"[INFO] Fetched valve ranking ({len(ranking)} teams)")
+    print(f"[INFO] Fetched valve ranking ({len(ranking)} teams)")
+    return ranking
+
+def get_valve_points(team_id, name, driver):
+    ranking = memo.get_or_fetch(ranking_memo_key(START_DATE),
+                                lambda: get_ranking_snapshot(ranking_url(START_DATE), driver), default={})
+    pts = HTMLUtils.points_for_team(ranking, team_id)
+    logging.info(f"[INFO] Valve points for: {name} ({pts} points)")
+    print(f"[INFO] Valve points for: {name} ({pts} points)")
     return pts
 
 def get_winrate(url, name, driver):
     logging.info(f"[INFO] Fetching winrate for: {name}")
     print(f"[INFO] Fetching winrate for: {name}")
 
-    html = fetch_page(url, driver)
+    html = fetch_html(url, driver)
     if html is None:
         logging.error(f"[ERROR] Couldn't fetch page: {url}")
         print(f"[ERROR] Couldn't fetch page: {url}")
-        return 0
-    stats = html.find_all(class_='large-strong')[1].text
+        return None
+    stats = PageParser.parse(html, PageParser.LARGE_STRONG).find_all(class_='large-strong')[1].text
     w, d, l = map(int, stats.split(" / "))
     if w + d + l == 0:
         logging.error(f"[ERROR] Couldn't fetch winrate for: {name}")
         print(f"[ERROR] Couldn't fetch winrate for: {name}")
-        return 0
+        return None
     logging.info(f"[INFO] Fetched winrate for: {name}")
     print(f"[INFO] Fetched winrate for: {name}")
     return round(w / (w + d + l) * 100, 1)
 
-def get_map_winrate(url, name, driver):
-    logging.info(f"[INFO] Fetching map winrate for: {name}")
-    print(f"[INFO] Fetching map winrate for: {name}")
+def get_team_map_winrates(url, name, driver):
+    logging.info(f"[INFO] Fetching map overview for: {name}")
+    print(f"[INFO] Fetching map overview for: {name}")
 
     html = fetch_page(url, driver)
     if html is None:
         logging.error(f"[ERROR] Couldn't fetch page: {url}")
         print(f"[ERROR] Couldn't fetch page: {url}")
-        return 0
-    map_stats = html.find_all(class_='stats-row')[1].find_all('span')[1].text
-    w, d, l = map(int, map_stats.split(" / "))
-    if w + d + l == 0:
-        logging.error(f"[ERROR] Couldn't fetch map winrate for {name}: {url}")
-        print(f"[ERROR] Couldn't fetch map winrate for {name}: {url}")
-        return 0
-    logging.info(f"[INFO] Fetched map winrate for {name}")
-    print(f"[INFO] Fetched map winrate for {name}")
-    return round(w / (w + d + l) * 100, 1)
+        return None
+    winrates = HTMLUtils.get_team_map_winrates(html)
+    if not winrates:
+        logging.error(f"[ERROR] Couldn't fetch map winrates for {name}: {url}")
+        print(f"[ERROR] Couldn't fetch map winrates for {name}: {url}")
+        return None
+    logging.info(f"[INFO] Fetched map overview for {name}")
+    print(f"[INFO] Fetched map overview for {name}")
+    return winrates
 
 def get_player_stats(name, player_id, driver):
     logging.info(f"[INFO] Fetching player stats for: {name} ({player_id})")
     print(f"[INFO] Fetching player stats: {name} ({player_id})")
 
     url = f"https://www.hltv.org/stats/players/matches/{player_id}/{name}?startDate={START_DATE.strftime('%Y-%m-%d')}&endDate={END_DATE.strftime('%Y-%m-%d')}"
-    html = fetch_page(url, driver)
+    html = fetch_html(url, driver)
     if html is None:
         logging.error(f"[ERROR] Couldn't fetch page: {url}")
         print(f"[ERROR] Couldn't fetch page: {url}")
-        return []
-    table = html.find(class_='stats-table')
+        return None
+    table = PageParser.parse(html, PageParser.STATS_TABLE).find(class_='stats-table')
     if table is None:
         logging.error(f"[ERROR] No stats-table found for PLAYER: {name} ({player_id})")
         print(f"[ERROR] No stats-table found for PLAYER: {name} ({player_id})")
-        return []
+        return None
 
     matches = table.find_all("tr", class_=["group-1", "group-2"], limit=10)
     stats = []
@@ -182,12 +226,15 @@ def get_team_stats(name, team_id, map_code, driver):
     logging.info(f"[INFO] Fetching team stats for: {name} ({team_id})")
     print(f"[INFO] Fetching team stats for: {name} ({team_id})")
 
-    stats_url_by_date = f"https://www.hltv.org/valve-ranking/teams/{START_DATE.year}/{month_dict[START_DATE.month]}/{START_DATE.day}?teamId={team_id}"
-    valve_pts = get_valve_points(stats_url_by_date, name, driver)
+    valve_pts = get_valve_points(team_id, name, driver)
     stats_team_url = f"https://www.hltv.org/stats/teams/{team_id}/{name}?startDate={START_DATE.strftime('%Y-%m-%d')}&endDate={END_DATE.strftime('%Y-%m-%d')}"
-    winrate = get_winrate(stats_team_url, name, driver)
-    stats_map_url = f"https://www.hltv.org/stats/teams/map/{map_code}/{team_id}/{name}?startDate={START_DATE.strftime('%Y-%m-%d')}&endDate={END_DATE.strftime('%Y-%m-%d')}"
-    map_winrate = get_map_winrate(stats_map_url, name, driver)
+    winrate = memo.get_or_fetch(SessionMemo.key("winrate", team_id, window=WINDOW),
+                                lambda: get_winrate(stats_team_url, name, driver), default=0)
+    # One overview page holds the team's winrate on every map, so it is memoized per team, not per map
+    stats_maps_url = f"https://www.hltv.org/stats/teams/maps/{team_id}/{name}?startDate={START_DATE.strftime('%Y-%m-%d')}&endDate={END_DATE.strftime('%Y-%m-%d')}"
+    map_winrates = memo.get_or_fetch(SessionMemo.key("mapwins", team_id, window=WINDOW),
+                                     lambda: get_team_map_winrates(stats_maps_url, name, driver), default={})
+    map_winrate = map_winrates.get(reverse_map_team_dict.get(map_code), 0)
     logging.info(f"[INFO] Fetched team stats for: {name} ({team_id})")
     print(f"[INFO] Fetched team stats for: {name} ({team_id})")
     return valve_pts, winrate, map_winrate
@@ -196,12 +243,12 @@ def get_head_to_head_stats(url, driver):
     logging.info("[INFO] Fetching head to head stats")
     print("[INFO] Fetching head to head stats")
 
-    html = fetch_page(url, driver)
+    html = fetch_html(url, driver)
     if html is None:
         logging.error(f"[ERROR] Couldn't fetch page: {url}")
         print(f"[ERROR] Couldn't fetch page: {url}")
         return [0, 0]
-    head_to_head_item = html.find(class_='head-to-head')
+    head_to_head_item = PageParser.parse(html, PageParser.HEAD_TO_HEAD).find(class_='head-to-head')
     if head_to_head_item is None:
         logging.error("[ERROR] Couldn't fetch head to head stats")
         print("[ERROR] Couldn't fetch head to head stats")
@@ -217,16 +264,16 @@ def get_recent_matches(name, team_id, driver):
     print(f"[INFO] Fetching recent matches for: {name} ({team_id})")
 
     url = f"https://www.hltv.org/stats/teams/matches/{team_id}/{name}?startDate={START_DATE.strftime('%Y-%m-%d')}&endDate={END_DATE.strftime('%Y-%m-%d')}"
-    html = fetch_page(url, driver)
+    html = fetch_html(url, driver)
     if html is None:
         logging.error(f"[ERROR] Couldn't fetch page: {url}")
         print(f"[ERROR] Couldn't fetch page: {url}")
-        return []
-    table = html.find(class_='stats-table')
+        return None
+    table = PageParser.parse(html, PageParser.STATS_TABLE).find(class_='stats-table')
     if table is None:
         logging.error(f"[ERROR] No stats-table found for recent matches: {name} ({team_id})")
         print(f"[ERROR] No stats-table found for recent matches: {name} ({team_id})")
-        return []
+        return None
 
     matches = table.find_all("tr", class_=["group-1", "group-2"], limit=10)
     recent_matches_list = []
@@ -240,20 +287,21 @@ def get_recent_matches(name, team_id, driver):
     return recent_matches_list
 
 def get_match_stats(url, map_code, driver):
+    """Scrape and save one match; returns False if its page couldn't be fetched, so it can be retried."""
     logging.info(f"[INFO] Fetching match stats for: {map_code}")
     print(f"[INFO] Fetching match stats for: {map_code}")
     html = fetch_page(url, driver)
     if html is None:
         logging.error(f"[ERROR] Couldn't fetch page: {url}")
         print(f"[ERROR] Couldn't fetch page: {url}")
-        return
+        return False
     unix = int(html.find("span", {"data-unix": True})["data-unix"]) / 1000
     date = datetime.fromtimestamp(unix) - timedelta(days=1)
 
     # Filter by date range
     if not (START_DATE <= date <= END_DATE):
         logging.info(f"[INFO] Skipping match {url}: Date {date.strftime('%Y-%m-%d')} outside range")
-        return
+        return True
 
     team1 = html.find(class_='team-left')
     team1_name = team1.find('a')['href'].split('/')[-1]
@@ -272,7 +320,9 @@ def get_match_stats(url, map_code, driver):
     for player in players:
         player_name = player.find("a")["href"].split('/')[-1]
         player_id = player.find("a")["href"].split('/')[-2]
-        players_list.append({"name": player_name, "stats": get_player_stats(player_name, player_id, driver)})
+        player_stats = memo.get_or_fetch(SessionMemo.key("player", player_id, window=WINDOW),
+                                         lambda: get_player_stats(player_name, player_id, driver), default=[])
+        players_list.append({"name": player_name, "stats": player_stats})
 
     result = "team1" if html.find(class_='team-left').find(class_='won') else "team2"
 
@@ -287,7 +337,8 @@ def get_match_stats(url, map_code, driver):
             "valve_points": team1_stats[0],
             "win_rate": team1_stats[1],
             "map_win_rate": team1_stats[2],
-            "recent_matches": get_recent_matches(team1_name, team1_id, driver),
+            "recent_matches": memo.get_or_fetch(SessionMemo.key("recent", team1_id, window=WINDOW),
+                                                lambda: get_recent_matches(team1_name, team1_id, driver), default=[]),
             "players": players_list[:5]
         },
         "team2": {
@@ -295,7 +346,8 @@ def get_match_stats(url, map_code, driver):
             "valve_points": team2_stats[0],
             "win_rate": team2_stats[1],
             "map_win_rate": team2_stats[2],
-            "recent_matches": get_recent_matches(team2_name, team2_id, driver),
+            "recent_matches": memo.get_or_fetch(SessionMemo.key("recent", team2_id, window=WINDOW),
+                                                lambda: get_recent_matches(team2_name, team2_id, driver), default=[]),
             "players": players_list[5:]
         },
         "head_to_head": {
@@ -308,58 +360,76 @@ def get_match_stats(url, map_code, driver):
     logging.info(f"[INFO] Fetched match stats for: {map_code}")
     print(f"[INFO] Fetched match stats for: {map_code}")
     save_match_data(match_data)
+    return True
 
-def get_dataset_by_team_matches(url, count, driver):
+def get_dataset_by_team_matches(url, count, driver, processed_matches):
     logging.info(f"[INFO] Fetching dataset by team matches for {count} matches: URL: = {url}")
     print(f"[INFO] Fetching dataset by team matches for {count} matches: URL: = {url}")
 
-    processed_matches = load_processed_matches()
     html = fetch_page(url, driver)
     if html is None:
         logging.error(f"[ERROR] Couldn't fetch page: {url}")
         print(f"[ERROR] Couldn't fetch page: {url}")
-        return []
+        return 0
 
     table = html.find(class_='stats-table')
     if table is None:
         logging.error(f"[ERROR] No stats-table found for URL: {url}")
         print(f"[ERROR] No stats-table found for URL: {url}")
-        return []
+        return 0
 
     matches = table.find_all("tr", class_=["group-1", "group-2"], limit=count)
 
+    map_codes = {}
     for match in matches:
-        start = time.time()
         match_url = match.find(class_='time').find('a')['href'].split('?')[0]
         match_url = f"https://www.hltv.org{match_url}"
+        map_name = match.find(class_='statsMapPlayed').text.strip()
+        map_codes[match_url] = map_team_dict.get(map_name, 0)
 
-        if match_exists(match_url, processed_matches):
-            print(f"[INFO] Match exists: {match_url}")
-            continue
+    new_urls = processed_matches.filter_new(map_codes.keys())
+    logging.info(f"[INFO] {len(map_codes) - len(new_urls)} of {len(map_codes)} matches already processed")
+    print(f"[INFO] {len(map_codes) - len(new_urls)} of {len(map_codes)} matches already processed")
 
-        map_name = match.find(class_='statsMapPlayed').text.strip()
-        map_code = map_team_dict.get(map_name, 0)
-        get_match_stats(match_url, map_code, driver)
+    scraped = 0
+    for match_url in new_urls:
+        # Another worker may have picked this match up since the table was filtered
+        if not processed_matches.claim(match_url):
+            continue
 
-        processed_matches.append(match_url)
-        save_processed_matches(processed_matches)
+        start = time.time()
+        done = False
+        try:
+            done = get_match_stats(match_url, map_codes[match_url], driver)
+        finally:
+            # Only a saved (or out of range) match is final; errors, Ctrl+C and fetch failures free it again
+            if done:
+                processed_matches.finish(match_url)
+            else:
+                processed_matches.release(match_url)
+        if not done:
+            continue
+        scraped += 1
         print(f"Time taken: {round(time.time() - start)} seconds")
-        time.sleep(random.uniform(3, 7))
 
     logging.info(f"[INFO] Fetched dataset for {count} matches")
     print(f"[INFO] Fetched dataset for {count} matches")
+    return scraped
 
 def create_dataset(count_teams, driver):
     logging.info(f"[INFO] Creating dataset for {count_teams} teams")
     print(f"[INFO] Creating dataset for {count_teams} teams")
 
-    date = START_DATE
-    url = f"https://www.hltv.org/valve-ranking/teams/{date.year}/{month_dict[date.month]}/{date.day}"
+    url = ranking_url(START_DATE)
     html = fetch_page(url, driver)
     if html is None:
         logging.error(f"[ERROR] Couldn't fetch page: {url}")
         print(f"[ERROR] Couldn't fetch page: {url}")
         return []
+    # This is the same page valve points are read from, so keep its parsed table (unless it's empty)
+    ranking = HTMLUtils.get_ranking_points(html)
+    if ranking:
+        memo.put(ranking_memo_key(START_DATE), ranking)
     item = html.find(class_='ranking')
     if item is None:
         logging.error(f"[ERROR] No ranking table found at: {url}")
@@ -379,30 +449,153 @@ def create_dataset(count_teams, driver):
     print(f"[INFO] Fetched dataset for {count_teams} teams")
     return teams_match_pages
 
-def start_scraper(team_limit, match_limit):
-    logging.info("[INFO] Starting scraping")
-    print("[INFO] Starting scraping")
-    logging.info(f"[INFO] Scraping {args.teams_limit} Teams at {args.match_limit} matches per team")
-    print(f"[INFO] Scraping {args.teams_limit} Teams at {args.match_limit} matches per team")
-
-    driver = Driver.get_driver()
+def _setup_driver(driver):
+    logging.info("[INFO] Starting browser")
+    print("[INFO] Starting browser")
     driver.execute_cdp_cmd("Network.enable", {})
     driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": Dictionary.adblock_list})
+    Driver.injectCookies(driver, COOKIE_FILE)
+
+def start_driver():
+    """A driver that only launches Chrome when a page actually needs the browser."""
+    return DriverPool(1, setup=_setup_driver)
+
+def scrape_team_pages(teams_match_pages, match_limit, driver=None):
+    """Scrape a list of team match pages; creates (and quits) its own driver when none is given."""
+    own_driver = driver is None and fetcher.backend != "archive"
+    if own_driver:
+        driver = start_driver()
+
+    processed_matches = load_processed_matches()
+    scraped = 0
     try:
-        teams_match_pages = create_dataset(team_limit, driver)
         for team_match_page in teams_match_pages:
             print(team_match_page.split('/')[-1])
-            get_dataset_by_team_matches(team_match_page, match_limit, driver)  # Reduced to 10 matches
+            scraped += get_dataset_by_team_matches(team_match_page, match_limit, driver, processed_matches)
     finally:
-        logging.info("[INFO] Finished")
-        print("[INFO] Finished")
-        driver.quit()  # Ensure driver is closed
+        processed_matches.close()
+        if own_driver:
+            driver.quit()
+        logging.info(f"[INFO] Memo: {memo.hits} hits, {memo.misses} page loads")
+        print(f"[INFO] Memo: {memo.hits} hits, {memo.misses} page loads")
+        logging.info(f"[INFO] Page memo: {page_memo.avoided} duplicate page loads avoided")
+        print(f"[INFO] Page memo: {page_memo.avoided} duplicate page loads avoided")
+        logging.info(f"[INFO] Fetch latency: {fetcher.stats.summary()}")
+        print(f"[INFO] Fetch latency: {fetcher.stats.summary()}")
+    return scraped
+
+def configure_rate_limiter(rate, burst, shared=None):
+    global limiter
+    limiter = RateLimiter(rate, burst, jitter=0.5, shared=shared)
+
+def configure_fetcher(backend=DEFAULT_BACKEND, archive_dir=ARCHIVE_DIR):
+    global fetcher
+    http = HttpFetcher(COOKIE_FILE) if backend in ("auto", "http") else None
+    archive = PageArchive(archive_dir) if archive_dir else None
+    fetcher = PageFetcher(backend, http=http, limiter=limiter, max_retries=MAX_CHALLENGE_RETRIES,
+                          on_challenge=_on_challenge, archive=archive)
+
+def configure_output(data_file, processed_db, legacy_processed_file=LEGACY_PROCESSED_FILE):
+    global DATA_FILE, PROCESSED_DB, LEGACY_PROCESSED_FILE
+    DATA_FILE, PROCESSED_DB, LEGACY_PROCESSED_FILE = data_file, processed_db, legacy_processed_file
+
+def configure_memo(memo_db=None):
+    global memo
+    memo.close()
+    memo = SessionMemo(memo_db)
+
+def _init_worker(write_lock, rate, burst, shared_rate_state, memo_db, ranking, backend, archive_dir, output):
+    global _write_lock
+    _write_lock = write_lock
+    configure_rate_limiter(rate, burst, shared_rate_state)
+    configure_fetcher(backend, archive_dir)
+    configure_output(*output)
+    configure_memo(memo_db)
+    if ranking:
+        memo.put(ranking_memo_key(START_DATE), ranking)
+
+def run_workers(teams_match_pages, match_limit, workers, rate=DEFAULT_RATE, burst=DEFAULT_BURST, memo_db=None,
+                backend=DEFAULT_BACKEND, archive_dir=ARCHIVE_DIR):
+    """Shard team pages round-robin over ``workers`` processes, each with its own driver (none offline)."""
+    if not teams_match_pages:
+        logging.info("[INFO] No team pages to scrape")
+        print("[INFO] No team pages to scrape")
+        return 0
+    workers = min(workers, len(teams_match_pages))
+    shards = [teams_match_pages[i::workers] for i in range(workers)]
+    logging.info(f"[INFO] Scraping {len(teams_match_pages)} team pages with {len(shards)} workers")
+    print(f"[INFO] Scraping {len(teams_match_pages)} team pages with {len(shards)} workers")
+
+    shared_rate_state = RateLimiter.shared_state()
+    ranking = memo.values.get(ranking_memo_key(START_DATE))
+    with Manager() as manager:
+        write_lock = manager.Lock()
+        with ProcessPoolExecutor(max_workers=len(shards), initializer=_init_worker,
+                                 initargs=(write_lock, rate, burst, shared_rate_state, memo_db, ranking, backend,
+                                           archive_dir, (DATA_FILE, PROCESSED_DB, LEGACY_PROCESSED_FILE))) as executor:
+            futures = [executor.submit(scrape_team_pages, shard, match_limit) for shard in shards]
+            return sum(future.result() for future in futures)
+
+def start_rebuild(output=REBUILD_DATA_FILE):
+    """Point the run at a fresh output file so every archived match is extracted again."""
+    for path in (output, REBUILD_PROCESSED_DB):
+        if os.path.exists(path):
+            os.remove(path)
+    configure_output(output, REBUILD_PROCESSED_DB, None)
+    logging.info(f"[INFO] Re-extracting archived pages into {output}")
+    print(f"[INFO] Re-extracting archived pages into {output}")
+
+def start_scraper(team_limit, match_limit, workers=1, rate=DEFAULT_RATE, burst=DEFAULT_BURST, memo_db=None,
+                  backend=DEFAULT_BACKEND, archive_dir=ARCHIVE_DIR, output=None):
+    logging.info("[INFO] Starting scraping")
+    print("[INFO] Starting scraping")
+    offline = backend == "archive"
+    if offline:
+        # No network, so no request budget; parsing is the only cost
+        rate = 0
+        start_rebuild(output or REBUILD_DATA_FILE)
+    elif output:
+        configure_output(output, PROCESSED_DB)
+    configure_rate_limiter(rate, burst)
+    configure_fetcher(backend, archive_dir)
+    configure_memo(memo_db)
+    if not offline and MatchStore.migrate_legacy(LEGACY_DATA_FILE, DATA_FILE):
+        logging.info(f"[INFO] Migrated {LEGACY_DATA_FILE} to {DATA_FILE}")
+        print(f"[INFO] Migrated {LEGACY_DATA_FILE} to {DATA_FILE}")
+    logging.info(f"[INFO] Scraping {team_limit} Teams at {match_limit} matches per team")
+    print(f"[INFO] Scraping {team_limit} Teams at {match_limit} matches per team")
+
+    start = time.time()
+    driver = None if offline else start_driver()
+    try:
+        teams_match_pages = create_dataset(team_limit, driver)
+        if workers <= 1:
+            scraped = scrape_team_pages(teams_match_pages, match_limit, driver)  # Reduced to 10 matches
+    finally:
+        if driver is not None:
+            driver.quit()  # Ensure driver is closed
+
+    if workers > 1:
+        scraped = run_workers(teams_match_pages, match_limit, workers, rate, burst, memo_db, backend, archive_dir)
+
+    elapsed = time.time() - start
+    logging.info(f"[INFO] Finished: {scraped} matches in {round(elapsed)} seconds")
+    print(f"[INFO] Finished: {scraped} matches in {round(elapsed)} seconds")
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Scrape HLTV Stats")
     parser.add_argument("--teams-limit", type=int, default=100, help="Number of teams to scrape (default: 25)")
     parser.add_argument("--match-limit", type=int, default=25, help="Number of matches to scrape per team (default: 10)")
+    parser.add_argument("--workers", type=int, default=None, help="Number of parallel scraper processes, each with its own browser (default: 1, or every CPU core with --backend archive)")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE, help=f"Requests per second shared by all workers (default: {DEFAULT_RATE})")
+    parser.add_argument("--burst", type=int, default=DEFAULT_BURST, help=f"Requests allowed back to back before throttling (default: {DEFAULT_BURST})")
+    parser.add_argument("--backend", choices=PageFetcher.BACKENDS, default=DEFAULT_BACKEND, help=f"Page fetch backend; auto uses HTTP and falls back to the browser on challenges (default: {DEFAULT_BACKEND})")
+    parser.add_argument("--archive-dir", default=ARCHIVE_DIR, help=f"Compressed archive of fetched pages, read by --backend archive (default: {ARCHIVE_DIR})")
+    parser.add_argument("--output", default=None, help=f"Match data file to write (default: {DATA_FILE}, or {REBUILD_DATA_FILE} with --backend archive)")
+    parser.add_argument("--memo-db", default=None, help="SQLite file to persist team/player sub-fetches across runs and workers (default: in memory)")
 
     args = parser.parse_args()
-    start_scraper(args.teams_limit, args.match_limit)
\ No newline at end of file
+    workers = args.workers or ((os.cpu_count() or 1) if args.backend == "archive" else 1)
+    start_scraper(args.teams_limit, args.match_limit, workers, args.rate, args.burst, args.memo_db, args.backend,
+                  args.archive_dir, args.output)
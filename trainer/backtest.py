@@ -0,0 +1,104 @@
+import argparse
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import accuracy_score, log_loss
+
+import train
+from train import DATA_FILE, _depth, _init_worker, load_dataset
+
+REPORT_FILE = '../model/backtest_report.json'
+
+def walk_forward_windows(dates, window_days, train_days=None, min_train=100):
+    """Yield ``(start, end, train_idx, test_idx)`` for consecutive test windows of ``window_days``.
+
+    Each window trains on the matches before its start (only the last
+    ``train_days`` if given) and tests on the matches inside it. Windows with
+    fewer than ``min_train`` training matches, or no test matches, are skipped.
+    """
+    known = ~np.isnat(dates)
+    if not known.any():
+        return
+    window = np.timedelta64(window_days, 'D')
+    start = dates[known].min()
+    last = dates[known].max()
+    while start <= last:
+        end = start + window
+        train_from = start - np.timedelta64(train_days, 'D') if train_days else dates[known].min()
+        train_idx = np.flatnonzero(known & (dates >= train_from) & (dates < start))
+        test_idx = np.flatnonzero(known & (dates >= start) & (dates < end))
+        if len(train_idx) >= min_train and len(test_idx):
+            yield str(start), str(end), train_idx, test_idx
+        start = end
+
+def _run_window(start, end, train_idx, test_idx, params, seed):
+    model = RandomForestClassifier(**params, random_state=seed, n_jobs=1)
+    t0 = time.perf_counter()
+    model.fit(train._X.iloc[train_idx], train._y[train_idx])
+    fit_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    proba = model.predict_proba(train._X.iloc[test_idx])
+    predict_s = time.perf_counter() - t0
+
+    # A window trained on a single class can only output that class
+    full = np.zeros((len(test_idx), 2))
+    full[:, model.classes_] = proba
+    y_test = train._y[test_idx]
+    return {
+        "start": start,
+        "end": end,
+        "train": len(train_idx),
+        "test": len(test_idx),
+        "accuracy": float(accuracy_score(y_test, full.argmax(axis=1))),
+        "log_loss": float(log_loss(y_test, full, labels=[0, 1])),
+        "fit_s": fit_s,
+        "predict_s": predict_s,
+    }
+
+def backtest(X, y, dates, params, window_days=14, train_days=None, min_train=100, jobs=None, seed=42):
+    """Score every walk-forward window in parallel; returns one row per window in date order."""
+    windows = list(walk_forward_windows(dates, window_days, train_days, min_train))
+    # train._init_worker sets train._X/_y once per worker, so the matrix isn't pickled with every window
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(X, y)) as executor:
+        futures = [executor.submit(_run_window, *window, params, seed) for window in windows]
+        return [future.result() for future in futures]
+
+def print_backtest(rows):
+    print(f"{'start':<10} {'end':<10} | {'train':>6} {'test':>5} | {'accuracy':>8} {'log_loss':>8} | {'fit s':>6} {'predict s':>9}")
+    for row in rows:
+        print(f"{row['start']:<10} {row['end']:<10} | {row['train']:>6} {row['test']:>5} | "
+              f"{row['accuracy']:8.3f} {row['log_loss']:8.3f} | {row['fit_s']:6.2f} {row['predict_s']:9.3f}")
+    if rows:
+        tested = sum(row['test'] for row in rows)
+        accuracy = sum(row['accuracy'] * row['test'] for row in rows) / tested
+        loss = sum(row['log_loss'] * row['test'] for row in rows) / tested
+        print(f"[INFO] {len(rows)} windows, {tested} matches scored: accuracy {accuracy:.3f}, log loss {loss:.3f}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Walk-forward backtest of the CS2 match model")
+    parser.add_argument("--data", default=DATA_FILE, help=f"Match data file (default: {DATA_FILE})")
+    parser.add_argument("--report", default=REPORT_FILE, help=f"JSON report of every window (default: {REPORT_FILE})")
+    parser.add_argument("--window-days", type=int, default=14, help="Length of each test window in days (default: 14)")
+    parser.add_argument("--train-days", type=int, default=None, help="Train only on this many days before each window (default: all earlier matches)")
+    parser.add_argument("--min-train", type=int, default=100, help="Skip windows with fewer earlier matches than this (default: 100)")
+    parser.add_argument("--estimators", type=int, default=100, help="n_estimators (default: 100)")
+    parser.add_argument("--max-depth", type=_depth, default=None, help="max_depth, 'none' for unlimited (default: none)")
+    parser.add_argument("--min-samples-leaf", type=int, default=1, help="min_samples_leaf (default: 1)")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes, one window each (default: all cores)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    args = parser.parse_args()
+
+    X, y, dates = load_dataset(args.data)
+    params = {"n_estimators": args.estimators, "max_depth": args.max_depth, "min_samples_leaf": args.min_samples_leaf}
+    start = time.perf_counter()
+    rows = backtest(X, y, dates, params, args.window_days, args.train_days, args.min_train, args.jobs, args.seed)
+    print_backtest(rows)
+    print(f"[INFO] Backtest finished in {time.perf_counter() - start:.2f}s")
+
+    with open(args.report, "w") as f:
+        json.dump({"params": params, "window_days": args.window_days, "train_days": args.train_days,
+                   "windows": rows}, f, indent=4)
+    print(f"[INFO] Report saved to {args.report}")
@@ -1,59 +1,239 @@
+import argparse
+import itertools
 import json
-import joblib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
 import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import accuracy_score
+from sklearn.metrics import accuracy_score, log_loss
+from sklearn.model_selection import StratifiedKFold, TimeSeriesSplit
+
+from utils.artifact import ModelArtifact
+from utils.features import FEATURE_COLUMNS, FeatureCache
+from utils.storage import MatchStore
+
+DATA_FILE = '../data/hltv_data.jsonl'
+MODEL_FILE = '../model/cs2_model.pkl'
+REPORT_FILE = '../model/train_report.json'
+
+def load_features(filepath):
+    """Return ``(X, y, dates, watermark)``, featurizing only matches the cached matrix hasn't seen.
 
-def load_data(filepath):
+    ``watermark`` identifies exactly which data the rows cover: the source
+    file, how many of its bytes and matches, and the sha256 of those bytes.
+    """
+    filepath = MatchStore.resolve_path(filepath)
     print(f"[INFO] Reading data from: {filepath}")
-    with open(filepath, 'r', encoding='utf-8') as file:
-        data = json.load(file)
-    return data
-
-def average_player_stats(team):
-    print(f"[INFO] Calculating average player stats for {team}")
-    avg_rating = np.mean([stat['rating2.0'] for player in team['players'] for stat in player['stats']])
-    avg_kd = np.mean([stat['kd'] for player in team['players'] for stat in player['stats']])
-    return avg_rating, avg_kd
-
-def process_match(match):
-    print(f"[INFO] Processing match: {match}")
-    features = {'team1_valve_points': match['team1']['valve_points'],
-                'team2_valve_points': match['team2']['valve_points'], 'team1_win_rate': match['team1']['win_rate'],
-                'team2_win_rate': match['team2']['win_rate'], 'team1_map_win_rate': match['team1']['map_win_rate'],
-                'team2_map_win_rate': match['team2']['map_win_rate'],
-                'team1_h2h_winrate': match['head_to_head']['team1_winrate'],
-                'team2_h2h_winrate': match['head_to_head']['team2_winrate'],
-                'team1_recent_wins': sum([1 if r == 'W' else 0 for r in match['team1']['recent_matches']]),
-                'team2_recent_wins': sum([1 if r == 'W' else 0 for r in match['team2']['recent_matches']]),
-                'team1_avg_rating': (average_player_stats(match['team1']))[0],
-                'team1_avg_kd': (average_player_stats(match['team1']))[1],
-                'team2_avg_rating': (average_player_stats(match['team2']))[0],
-                'team2_avg_kd': (average_player_stats(match['team2']))[1],
-                'result': 1 if match['result'] == 'team1' else 0}
-
-    return features
-
-def prepare_dataset(data):
-    print(f"[INFO] Preparing dataset")
-    dataset = [process_match(match) for match in data]
-    return pd.DataFrame(dataset)
-
-data = load_data('../data/hltv_data.json')
-df = prepare_dataset(data)
-
-X = df.drop(columns=['result'])
-y = df['result']
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-
-model = RandomForestClassifier(n_estimators=100, random_state=42)
-model.fit(X_train, y_train)
-
-y_pred = model.predict(X_test)
-accuracy = accuracy_score(y_test, y_pred)
-print(f'[INFO] Accuracy: {accuracy:.2f}')
-
-joblib.dump(model, '../model/cs2_model.pkl')
-print("[INFO] Model saved as cs2_model.pkl")
\ No newline at end of file
+    start = time.perf_counter()
+    cache = FeatureCache(filepath)
+    X, y, dates = cache.load()
+    action = "rebuilt" if cache.rebuilt else f"{cache.added} new matches added"
+    print(f"[INFO] Loaded {len(y)} matches in {time.perf_counter() - start:.2f}s (feature cache {action})")
+    # Absolute, so an incremental run from another working directory still matches it
+    watermark = {"source": os.path.abspath(os.path.normpath(filepath)), "offset": cache.offset, "sha256": cache.sha256, "matches": int(len(y))}
+    return pd.DataFrame(X, columns=FEATURE_COLUMNS), y, dates, watermark
+
+def load_dataset(filepath):
+    """Return ``(X, y, dates)``, featurizing only matches the cached matrix hasn't seen."""
+    X, y, dates, _ = load_features(filepath)
+    return X, y, dates
+
+def param_grid(estimators, max_depths, min_samples_leafs):
+    return [
+        {"n_estimators": n, "max_depth": depth, "min_samples_leaf": leaf}
+        for n, depth, leaf in itertools.product(estimators, max_depths, min_samples_leafs)
+    ]
+
+def cv_splits(y, dates, folds, cv, seed):
+    """Return ``[(train_idx, test_idx)]``; ``time`` folds always test on matches after the training ones."""
+    if cv == "time":
+        order = np.argsort(dates, kind="stable")
+        return [(order[train], order[test]) for train, test in TimeSeriesSplit(n_splits=folds).split(order)]
+    return list(StratifiedKFold(n_splits=folds, shuffle=True, random_state=seed).split(np.zeros(len(y)), y))
+
+# Set once per worker process so the matrix isn't pickled with every task
+_X = None
+_y = None
+
+def _init_worker(X, y):
+    global _X, _y
+    _X, _y = X, y
+
+def _fit_fold(config_idx, params, train_idx, test_idx, seed):
+    model = RandomForestClassifier(**params, random_state=seed, n_jobs=1)
+    start = time.perf_counter()
+    model.fit(_X.iloc[train_idx], _y[train_idx])
+    fit_s = time.perf_counter() - start
+    start = time.perf_counter()
+    y_pred = model.predict(_X.iloc[test_idx])
+    predict_s = time.perf_counter() - start
+    return config_idx, accuracy_score(_y[test_idx], y_pred), fit_s, predict_s
+
+def cross_validate(X, y, dates, configs, folds=5, cv="kfold", jobs=None, seed=42):
+    """Fit every (configuration, fold) pair in a process pool and return one report row per configuration."""
+    splits = cv_splits(y, dates, folds, cv, seed)
+    results = {i: [] for i in range(len(configs))}
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(X, y)) as executor:
+        futures = [
+            executor.submit(_fit_fold, i, params, train_idx, test_idx, seed)
+            for i, params in enumerate(configs)
+            for train_idx, test_idx in splits
+        ]
+        for future in futures:
+            config_idx, accuracy, fit_s, predict_s = future.result()
+            results[config_idx].append((accuracy, fit_s, predict_s))
+
+    report = []
+    for i, params in enumerate(configs):
+        accuracy, fit_s, predict_s = np.array(results[i]).T
+        report.append({
+            "params": params,
+            "cv": cv,
+            "folds": len(splits),
+            "accuracy_mean": float(accuracy.mean()),
+            "accuracy_std": float(accuracy.std()),
+            "fit_s_mean": float(fit_s.mean()),
+            "predict_s_mean": float(predict_s.mean()),
+        })
+    return report
+
+def print_report(report):
+    print(f"{'n_estimators':>12} {'max_depth':>9} {'min_leaf':>8} | {'accuracy':>15} | {'fit s':>7} {'predict s':>9}")
+    for row in sorted(report, key=lambda r: r["accuracy_mean"], reverse=True):
+        p = row["params"]
+        print(f"{p['n_estimators']:>12} {str(p['max_depth']):>9} {p['min_samples_leaf']:>8} | "
+              f"{row['accuracy_mean']:.3f} +/- {row['accuracy_std']:.3f} | "
+              f"{row['fit_s_mean']:7.2f} {row['predict_s_mean']:9.3f}")
+
+def fit_final(X, y, params, jobs=-1, seed=42):
+    """Fit ``params`` on every match; returns ``(model, fit seconds)``."""
+    model = RandomForestClassifier(**params, random_state=seed, n_jobs=jobs)
+    start = time.perf_counter()
+    model.fit(X, y)
+    fit_s = time.perf_counter() - start
+    print(f"[INFO] Fitted final model on {len(y)} matches in {fit_s:.2f}s")
+    return model, fit_s
+
+def incremental_start(model_path, watermark):
+    """Return how many leading matches the saved model was trained on, or ``None`` if it can't be extended.
+
+    The model's watermark must still describe a prefix of the current data
+    (same bytes, hashed), and the feature columns must be unchanged.
+    """
+    metadata = ModelArtifact.read_sidecar(model_path)
+    if not metadata or not os.path.exists(model_path) or metadata.get("features") != FEATURE_COLUMNS:
+        return None
+    seen = metadata.get("watermark")
+    if not seen or seen.get("source") != watermark["source"] or seen["matches"] > watermark["matches"]:
+        return None
+    if not FeatureCache(watermark["source"]).matches_prefix(seen["offset"], seen["sha256"]):
+        return None
+    return seen["matches"]
+
+def add_trees(model, X_new, y_new, n_trees, jobs=-1):
+    """Grow ``n_trees`` more trees on the new matches only, keeping the existing ones; returns ``(model, fit seconds)``."""
+    model.set_params(warm_start=True, n_estimators=len(model.estimators_) + n_trees, n_jobs=jobs)
+    start = time.perf_counter()
+    model.fit(X_new, y_new)
+    fit_s = time.perf_counter() - start
+    model.set_params(warm_start=False)
+    print(f"[INFO] Added {n_trees} trees on {len(y_new)} new matches in {fit_s:.2f}s ({len(model.estimators_)} trees total)")
+    return model, fit_s
+
+def update_model(args, X, y, watermark):
+    """Incrementally update the saved model; returns False if it has to be retrained from scratch instead."""
+    seen = incremental_start(args.model_out, watermark)
+    if seen is None:
+        print(f"[INFO] {args.model_out} has no watermark matching {watermark['source']}; training from scratch")
+        return False
+
+    X_new, y_new = X.iloc[seen:], y[seen:]
+    if len(y_new) == 0:
+        print(f"[INFO] No new matches since the model was trained ({seen} matches); nothing to do")
+        return True
+    # A warm-started forest refits classes_ on the new batch alone, so it must contain both outcomes
+    if len(y_new) < args.min_new or len(np.unique(y_new)) < 2:
+        print(f"[WARN] Only {len(y_new)} new matches ({len(np.unique(y_new))} outcome(s)); "
+              f"waiting for at least {args.min_new} with both outcomes before updating")
+        return True
+
+    model = ModelArtifact.load(args.model_out)
+    # The new matches are unseen by the current model, so score them before they're trained on
+    proba = model.predict_proba(X_new)
+    metrics = {
+        "new_matches": int(len(y_new)),
+        "accuracy_before_update": float(accuracy_score(y_new, model.classes_[proba.argmax(axis=1)])),
+        "log_loss_before_update": float(log_loss(y_new, proba, labels=model.classes_)),
+    }
+    print(f"[INFO] Current model on the {len(y_new)} new matches: accuracy {metrics['accuracy_before_update']:.3f}, "
+          f"log loss {metrics['log_loss_before_update']:.3f}")
+    model, fit_s = add_trees(model, X_new, y_new, args.add_trees, args.jobs or -1)
+
+    metadata = ModelArtifact.read_sidecar(args.model_out)
+    metadata.update({
+        "trained_at": datetime.now().isoformat(timespec="seconds"),
+        "train_time_s": fit_s,
+        "n_estimators": len(model.estimators_),
+        "watermark": watermark,
+        "metrics": metrics,
+        "incremental_updates": metadata.get("incremental_updates", 0) + 1,
+    })
+    ModelArtifact.save(model, args.model_out, metadata)
+    print(f"[INFO] Model saved as {args.model_out} (trained to {watermark['matches']} matches)")
+    return True
+
+def _depth(value):
+    return None if value.lower() == "none" else int(value)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train the CS2 match model")
+    parser.add_argument("--data", default=DATA_FILE, help=f"Match data file (default: {DATA_FILE})")
+    parser.add_argument("--model-out", default=MODEL_FILE, help=f"Where to save the best model (default: {MODEL_FILE})")
+    parser.add_argument("--report", default=REPORT_FILE, help=f"JSON report of every configuration (default: {REPORT_FILE})")
+    parser.add_argument("--estimators", type=int, nargs="+", default=[100], help="n_estimators values to search (default: 100)")
+    parser.add_argument("--max-depth", type=_depth, nargs="+", default=[None], help="max_depth values to search, 'none' for unlimited (default: none)")
+    parser.add_argument("--min-samples-leaf", type=int, nargs="+", default=[1], help="min_samples_leaf values to search (default: 1)")
+    parser.add_argument("--folds", type=int, default=5, help="Cross-validation folds (default: 5)")
+    parser.add_argument("--cv", choices=["kfold", "time"], default="kfold", help="Shuffled stratified k-fold, or time-ordered folds that always test on later matches (default: kfold)")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes for the search and cores for the final fit (default: all cores)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42)")
+    parser.add_argument("--incremental", action="store_true", help="Add trees for matches scraped since the saved model instead of retraining")
+    parser.add_argument("--add-trees", type=int, default=20, help="Trees to add per incremental update (default: 20)")
+    parser.add_argument("--min-new", type=int, default=50, help="New matches needed before an incremental update (default: 50)")
+    args = parser.parse_args()
+
+    X, y, dates, watermark = load_features(args.data)
+    if args.incremental and update_model(args, X, y, watermark):
+        raise SystemExit(0)
+
+    configs = param_grid(args.estimators, args.max_depth, args.min_samples_leaf)
+    print(f"[INFO] Evaluating {len(configs)} configurations with {args.folds}-fold {args.cv} CV")
+    start = time.perf_counter()
+    report = cross_validate(X, y, dates, configs, args.folds, args.cv, args.jobs, args.seed)
+    print(f"[INFO] Search finished in {time.perf_counter() - start:.2f}s")
+    print_report(report)
+
+    best = max(report, key=lambda r: r["accuracy_mean"])
+    print(f"[INFO] Best: {best['params']} (accuracy {best['accuracy_mean']:.2f})")
+    model, fit_s = fit_final(X, y, best["params"], args.jobs or -1, args.seed)
+
+    with open(args.report, "w") as f:
+        json.dump(report, f, indent=4)
+    print(f"[INFO] Report saved to {args.report}")
+
+    ModelArtifact.save(model, args.model_out, {
+        "trained_at": datetime.now().isoformat(timespec="seconds"),
+        "train_time_s": fit_s,
+        "features": FEATURE_COLUMNS,
+        "params": best["params"],
+        "n_estimators": len(model.estimators_),
+        "watermark": watermark,
+        "metrics": {"cv": best["cv"], "folds": best["folds"], "accuracy_mean": best["accuracy_mean"],
+                    "accuracy_std": best["accuracy_std"]},
+        "incremental_updates": 0,
+    })
+    print(f"[INFO] Model saved as {args.model_out} (trained to {watermark['matches']} matches)")
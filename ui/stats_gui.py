@@ -7,12 +7,13 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 
 from utils.helpers import Settings  # noqa: E402
+from utils.storage import MatchStore  # noqa: E402
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if BASE_DIR not in sys.path:
     sys.path.insert(0, BASE_DIR)
 
-DATA_FILE = os.path.join(BASE_DIR, "data", "hltv_data.json")
+DATA_FILE = os.path.join(BASE_DIR, "data", "hltv_data.jsonl")
 THEME_FILES = {
     "light": os.path.join(BASE_DIR, "ui", "forest-light.tcl"),
     "dark": os.path.join(BASE_DIR, "ui", "forest-dark.tcl"),
@@ -22,7 +23,7 @@ class StatsData:
     """Load and aggregate match, team, and player statistics."""
 
     def __init__(self, data_path: str = DATA_FILE):
-        self.data_path = data_path
+        self.data_path = MatchStore.resolve_path(data_path)
         self.matches = self._load_matches()
         self.teams = self._build_teams()
 
@@ -30,13 +31,7 @@ class StatsData:
         if not os.path.exists(self.data_path):
             raise FileNotFoundError(f"Data file not found: {self.data_path}")
 
-        with open(self.data_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        if not isinstance(data, list):
-            raise ValueError("hltv_data.json should contain a list of matches")
-
-        return data
+        return list(MatchStore.iter_matches(self.data_path))
 
     def _build_teams(self):
         teams = {}
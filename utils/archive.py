@@ -0,0 +1,107 @@
+import gzip
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class PageArchive:
+    """Content-addressed store of fetched page HTML for offline re-extraction.
+
+    Each distinct page body is compressed once (zstd when ``zstandard`` is
+    installed, gzip otherwise) under ``objects/<sha[:2]>/<sha>``; an SQLite
+    index maps ``(url, fetched_at)`` to the blob, so re-fetching an unchanged
+    page only adds an index row. ``get`` returns the newest copy of a URL.
+    """
+
+    ZSTD = "zstd"
+    GZIP = "gzip"
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(os.path.join(root, "index.db"), check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages (url TEXT, fetched_at REAL, sha256 TEXT, codec TEXT, size INTEGER, "
+            "PRIMARY KEY (url, fetched_at))"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_sha ON pages (sha256)")
+        self.conn.commit()
+
+    def _blob_path(self, sha, codec):
+        ext = ".zst" if codec == self.ZSTD else ".gz"
+        return os.path.join(self.root, "objects", sha[:2], sha + ext)
+
+    @staticmethod
+    def _compress(data):
+        if zstandard is not None:
+            return PageArchive.ZSTD, zstandard.ZstdCompressor(level=9).compress(data)
+        return PageArchive.GZIP, gzip.compress(data, compresslevel=6)
+
+    @staticmethod
+    def _decompress(codec, blob):
+        if codec == PageArchive.ZSTD:
+            if zstandard is None:
+                raise RuntimeError("zstandard is needed to read zstd-archived pages")
+            return zstandard.ZstdDecompressor().decompress(blob)
+        return gzip.decompress(blob)
+
+    def put(self, url, html, fetched_at=None):
+        """Archive ``html`` as fetched from ``url``; returns its sha256."""
+        data = html.encode("utf-8")
+        sha = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            row = self.conn.execute("SELECT codec FROM pages WHERE sha256=? LIMIT 1", (sha,)).fetchone()
+        codec = row[0] if row else None
+        if codec is None or not os.path.exists(self._blob_path(sha, codec)):
+            codec, blob = self._compress(data)
+            path = self._blob_path(sha, codec)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, path)
+
+        with self._lock:
+            self.conn.execute("REPLACE INTO pages (url, fetched_at, sha256, codec, size) VALUES (?, ?, ?, ?, ?)",
+                              (url, fetched_at or time.time(), sha, codec, len(data)))
+            self.conn.commit()
+        return sha
+
+    def get(self, url, before=None):
+        """Return the newest archived HTML for ``url`` (fetched at or before ``before``), or ``None``."""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT sha256, codec FROM pages WHERE url=? AND fetched_at<=? ORDER BY fetched_at DESC LIMIT 1",
+                (url, before if before is not None else float("inf")),
+            ).fetchone()
+        if row is None:
+            return None
+        sha, codec = row
+        try:
+            with open(self._blob_path(sha, codec), "rb") as f:
+                return self._decompress(codec, f.read()).decode("utf-8")
+        except FileNotFoundError:
+            return None
+
+    def __contains__(self, url):
+        with self._lock:
+            return self.conn.execute("SELECT 1 FROM pages WHERE url=? LIMIT 1", (url,)).fetchone() is not None
+
+    def __len__(self):
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(DISTINCT url) FROM pages").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
@@ -0,0 +1,94 @@
+import glob
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+
+import joblib
+
+from utils.forest import FlatForest
+
+
+class ModelArtifact:
+    """A trained model: the pickle, its flattened forest (memory-mappable ``.npy`` files) and a JSON sidecar."""
+
+    @staticmethod
+    def sidecar_path(model_path):
+        return os.path.splitext(model_path)[0] + ".json"
+
+    @staticmethod
+    def read_sidecar(model_path):
+        """Return the sidecar dict for ``model_path``, or ``None`` if it's missing or unreadable."""
+        try:
+            with open(ModelArtifact.sidecar_path(model_path), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def write_sidecar(model_path, metadata):
+        path = ModelArtifact.sidecar_path(model_path)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(metadata, f, indent=4)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def file_sha256(path):
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _forest_prefix(model_path):
+        return os.path.splitext(model_path)[0] + ".forest-"
+
+    @staticmethod
+    def save(model, model_path, metadata):
+        """Dump ``model``, its flattened forest and its sidecar; returns the full sidecar dict."""
+        tmp_path = model_path + ".tmp"
+        joblib.dump(model, tmp_path)
+        os.replace(tmp_path, model_path)
+        metadata = dict(metadata)
+        metadata.update({
+            "estimator": type(model).__name__,
+            "estimator_module": type(model).__module__,
+            "saved_at": datetime.now().isoformat(timespec="seconds"),
+            "size_bytes": os.path.getsize(model_path),
+            "sha256": ModelArtifact.file_sha256(model_path),
+        })
+
+        # Each model version gets its own directory: a running GUI may still have the old arrays mapped
+        forest_dir = ModelArtifact._forest_prefix(model_path) + metadata["sha256"][:12]
+        try:
+            FlatForest.compile(model).save(forest_dir)
+            metadata["flat_forest"] = os.path.basename(forest_dir)
+        except TypeError:
+            metadata.pop("flat_forest", None)
+        ModelArtifact.write_sidecar(model_path, metadata)
+
+        for old_dir in glob.glob(ModelArtifact._forest_prefix(model_path) + "*"):
+            if old_dir != forest_dir:
+                shutil.rmtree(old_dir, ignore_errors=True)
+        return metadata
+
+    @staticmethod
+    def load(model_path):
+        return joblib.load(model_path)
+
+    @staticmethod
+    def load_flat(model_path):
+        """Memory-map the flattened forest saved with ``model_path``; ``None`` if there is none or it's stale."""
+        metadata = ModelArtifact.read_sidecar(model_path)
+        if not metadata or not metadata.get("flat_forest"):
+            return None
+        forest_dir = os.path.join(os.path.dirname(model_path), metadata["flat_forest"])
+        try:
+            if os.path.getsize(model_path) != metadata.get("size_bytes"):
+                return None
+            return FlatForest.load(forest_dir)
+        except (OSError, ValueError):
+            return None
@@ -1,23 +1,93 @@
+import atexit
 import pickle
+import sqlite3
+import threading
+import time
 import tkinter as tk
+from contextlib import contextmanager
 from datetime import datetime
-import sqlite3
 
 from utils.helpers import Utils
+from utils.serialization import CacheCodec
 
 
 class Database:
+    # One long-lived connection per (thread, db path); sqlite3 keeps a compiled
+    # statement cache on each connection, so repeated queries are prepared once.
+    _local = threading.local()
+    _connections = []
+    _connections_lock = threading.Lock()
+
+    # Stay below SQLite's default host-parameter limit for IN (...) queries
+    MAX_BATCH = 500
+
+    @staticmethod
+    def _connect(db):
+        conn = sqlite3.connect(db, check_same_thread=False, isolation_level=None, cached_statements=256)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        with Database._connections_lock:
+            Database._connections.append(conn)
+        return conn
+
     @staticmethod
     def get_db(db):
-        conn = sqlite3.connect(db, check_same_thread=False)
+        conns = getattr(Database._local, "conns", None)
+        if conns is None:
+            conns = Database._local.conns = {}
+        conn = conns.get(db)
+        if conn is None:
+            conn = conns[db] = Database._connect(db)
         return conn, conn.cursor()
 
     @staticmethod
-    def initialize_cache_db(db):
+    @contextmanager
+    def transaction(db):
+        """Group several statements into one commit; nested uses join the outer transaction."""
         conn, cursor = Database.get_db(db)
-        cursor.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, timestamp REAL)")
+        if conn.in_transaction:
+            yield cursor
+            return
+
+        cursor.execute("BEGIN")
+        try:
+            yield cursor
+        except BaseException:
+            conn.rollback()
+            raise
         conn.commit()
-        conn.close()
+
+    @staticmethod
+    def close_all():
+        with Database._connections_lock:
+            for conn in Database._connections:
+                try:
+                    conn.close()
+                except sqlite3.Error:
+                    pass
+            Database._connections.clear()
+        Database._local = threading.local()
+
+    @staticmethod
+    def initialize_cache_db(db):
+        conn, cursor = Database.get_db(db)
+        cursor.execute("PRAGMA auto_vacuum")
+        if cursor.fetchone()[0] != 2:
+            # Switching an existing file to incremental auto-vacuum needs one full VACUUM
+            cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            cursor.execute("VACUUM")
+
+        with Database.transaction(db) as cursor:
+            cursor.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB, timestamp REAL, last_access REAL, codec TEXT)")
+            columns = {row[1] for row in cursor.execute("PRAGMA table_info(cache)")}
+            if "last_access" not in columns:
+                cursor.execute("ALTER TABLE cache ADD COLUMN last_access REAL")
+            if "codec" not in columns:
+                # Existing rows keep codec NULL and are decoded as pickle
+                cursor.execute("ALTER TABLE cache ADD COLUMN codec TEXT")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cache_timestamp ON cache (timestamp)")
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache (last_access)")
 
     @staticmethod
     def _expired_ts(ts, ceh):
@@ -26,51 +96,184 @@ class Database:
     @staticmethod
     def cache_get(db_key, db, ceh):
         conn, cursor = Database.get_db(db)
-        cursor.execute("SELECT value, timestamp FROM cache WHERE key=?", (db_key,))
+        cursor.execute("SELECT value, timestamp, codec FROM cache WHERE key=?", (db_key,))
         row = cursor.fetchone()
-        conn.close()
 
         if not row:
             return None
 
-        value, ts = row
+        value, ts, codec = row
         if Database._expired_ts(ts, ceh):
             Database.cache_delete(db_key, db)
             return None
 
-        return pickle.loads(value)
+        cursor.execute("UPDATE cache SET last_access=? WHERE key=?", (datetime.now().timestamp(), db_key))
+        return CacheCodec.decode(codec, value)
 
     @staticmethod
     def cache_set(db_key, value, db):
+        codec, blob = CacheCodec.encode(value)
+        ts = datetime.now().timestamp()
+        with Database.transaction(db) as cursor:
+            cursor.execute("REPLACE INTO cache (key, value, timestamp, last_access, codec) VALUES (?, ?, ?, ?, ?)",
+                           (db_key, blob, ts, ts, codec))
+
+    @staticmethod
+    def cache_get_many(db_keys, db, ceh):
+        """Return ``{key: value}`` for every fresh cached key; expired rows are dropped in one delete."""
         conn, cursor = Database.get_db(db)
-        blob = pickle.dumps(value)
+        keys = list(dict.fromkeys(db_keys))
+        found, expired = {}, []
+
+        for i in range(0, len(keys), Database.MAX_BATCH):
+            chunk = keys[i:i + Database.MAX_BATCH]
+            placeholders = ",".join("?" * len(chunk))
+            cursor.execute(f"SELECT key, value, timestamp, codec FROM cache WHERE key IN ({placeholders})", chunk)
+            for key, value, ts, codec in cursor.fetchall():
+                if Database._expired_ts(ts, ceh):
+                    expired.append(key)
+                else:
+                    found[key] = CacheCodec.decode(codec, value)
+
+        if expired:
+            Database.cache_delete_many(expired, db)
+        if found:
+            Database._touch_many(found.keys(), db)
+        return found
+
+    @staticmethod
+    def _touch_many(db_keys, db):
+        keys = list(db_keys)
+        now = datetime.now().timestamp()
+        with Database.transaction(db) as cursor:
+            for i in range(0, len(keys), Database.MAX_BATCH):
+                chunk = keys[i:i + Database.MAX_BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(f"UPDATE cache SET last_access=? WHERE key IN ({placeholders})", [now, *chunk])
+
+    @staticmethod
+    def cache_set_many(items, db):
+        """Store every ``(key, value)`` pair (or dict item) in a single transaction."""
+        pairs = items.items() if isinstance(items, dict) else items
         ts = datetime.now().timestamp()
-        cursor.execute("REPLACE INTO cache (key, value, timestamp) VALUES (?, ?, ?)", (db_key, blob, ts))
-        conn.commit()
-        conn.close()
+        rows = [(key, *CacheCodec.encode(value)[::-1], ts, ts) for key, value in pairs]
+        if not rows:
+            return
+        with Database.transaction(db) as cursor:
+            cursor.executemany("REPLACE INTO cache (key, value, codec, timestamp, last_access) VALUES (?, ?, ?, ?, ?)", rows)
+
+    @staticmethod
+    def cache_delete_many(db_keys, db):
+        keys = list(db_keys)
+        with Database.transaction(db) as cursor:
+            for i in range(0, len(keys), Database.MAX_BATCH):
+                chunk = keys[i:i + Database.MAX_BATCH]
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(f"DELETE FROM cache WHERE key IN ({placeholders})", chunk)
 
     @staticmethod
     def cache_delete(db_key, db):
-        conn, cursor = Database.get_db(db)
-        cursor.execute("DELETE FROM cache WHERE key=?", (db_key,))
-        conn.commit()
-        conn.close()
+        with Database.transaction(db) as cursor:
+            cursor.execute("DELETE FROM cache WHERE key=?", (db_key,))
+
+    @staticmethod
+    def purge_expired(db, ceh):
+        """Delete every expired row in one statement and return how many were removed."""
+        cutoff = datetime.now().timestamp() - ceh * 3600
+        with Database.transaction(db) as cursor:
+            cursor.execute("DELETE FROM cache WHERE timestamp < ?", (cutoff,))
+            return cursor.rowcount
+
+    @staticmethod
+    def evict_lru(db, max_entries=0, max_mb=0):
+        """Drop least recently used rows until the cache fits ``max_entries`` / ``max_mb`` (0 = no limit)."""
+        removed = 0
+        with Database.transaction(db) as cursor:
+            if max_entries:
+                cursor.execute(
+                    "DELETE FROM cache WHERE key IN ("
+                    "SELECT key FROM cache ORDER BY COALESCE(last_access, timestamp) DESC LIMIT -1 OFFSET ?)",
+                    (max_entries,),
+                )
+                removed += cursor.rowcount
+            if max_mb:
+                cursor.execute(
+                    "DELETE FROM cache WHERE key IN ("
+                    "SELECT key FROM (SELECT key, SUM(LENGTH(value)) OVER "
+                    "(ORDER BY COALESCE(last_access, timestamp) DESC, key) AS running FROM cache) "
+                    "WHERE running > ?)",
+                    (int(max_mb * 1024 * 1024),),
+                )
+                removed += cursor.rowcount
+        return removed
+
+    @staticmethod
+    def sweep_cache(db, ceh, max_entries=0, max_mb=0, vacuum_pages=256):
+        """Purge expired rows, apply the size policy and release up to ``vacuum_pages`` free pages."""
+        expired = Database.purge_expired(db, ceh)
+        evicted = Database.evict_lru(db, max_entries, max_mb)
+        if expired or evicted:
+            conn, cursor = Database.get_db(db)
+            cursor.execute(f"PRAGMA incremental_vacuum({int(vacuum_pages)})")
+            cursor.fetchall()
+        return expired, evicted
+
+    @staticmethod
+    def start_sweeper(sweep_fn, interval_s):
+        """Call ``sweep_fn`` every ``interval_s`` seconds on a daemon thread; returns a stop event."""
+        stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval_s):
+                try:
+                    sweep_fn()
+                except sqlite3.Error as e:
+                    print(f"[WARN] Cache sweep failed: {e}")
+
+        threading.Thread(target=run, name="cache-sweeper", daemon=True).start()
+        return stop
 
     @staticmethod
     def clear_cache(db, rt, pgr):
-        conn, cursor = Database.get_db(db)
-        cursor.execute("DELETE FROM cache")
-        conn.commit()
-        conn.close()
+        with Database.transaction(db) as cursor:
+            cursor.execute("DELETE FROM cache")
         Utils.status_cb("Cache cleared successfully.", rt, pgr, level="good")
 
+    @staticmethod
+    def cache_codec_stats(db):
+        """Per-codec row counts, stored bytes, pickle-equivalent bytes and decode time."""
+        conn, cursor = Database.get_db(db)
+        cursor.execute("SELECT codec, value FROM cache")
+        stats = {}
+        for codec, value in cursor.fetchall():
+            entry = stats.setdefault(codec or CacheCodec.PICKLE, {"count": 0, "bytes": 0, "pickle_bytes": 0, "decode_s": 0.0})
+            start = time.perf_counter()
+            decoded = CacheCodec.decode(codec, value)
+            entry["decode_s"] += time.perf_counter() - start
+            entry["count"] += 1
+            entry["bytes"] += len(value)
+            entry["pickle_bytes"] += len(value) if codec in (None, CacheCodec.PICKLE) else len(pickle.dumps(decoded))
+        return stats
+
     @staticmethod
     def view_cache_stats(db, root):
         conn, cursor = Database.get_db(db)
         cursor.execute("SELECT COUNT(*), SUM(LENGTH(value)) FROM cache")
         count, size = cursor.fetchone()
         size = size if size else 0
+        codec_stats = Database.cache_codec_stats(db)
+        saved = sum(s["pickle_bytes"] - s["bytes"] for s in codec_stats.values())
+        decode_s = sum(s["decode_s"] for s in codec_stats.values())
+
         stats_window = tk.Toplevel(root)
         stats_window.title("Cache Statistics")
         tk.Label(stats_window, text=f"Cached Entries: {count}").pack()
-        tk.Label(stats_window, text=f"Database Size: {size / 1024:.2f} KB").pack()
\ No newline at end of file
+        tk.Label(stats_window, text=f"Database Size: {size / 1024:.2f} KB").pack()
+        tk.Label(stats_window, text=f"Saved vs Pickle: {saved / 1024:.2f} KB").pack()
+        tk.Label(stats_window, text=f"Decode Time (all entries): {decode_s * 1000:.2f} ms").pack()
+        for codec, entry in sorted(codec_stats.items()):
+            avg_us = entry["decode_s"] / entry["count"] * 1e6
+            tk.Label(stats_window, text=f"{codec}: {entry['count']} entries, "
+                                        f"{entry['bytes'] / 1024:.2f} KB, {avg_us:.1f} us/decode").pack()
+
+atexit.register(Database.close_all)
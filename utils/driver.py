@@ -1,8 +1,16 @@
 import json
 import logging
+import queue
+import re
+import threading
 import time
+from contextlib import contextmanager
+
 import undetected_chromedriver as uc
 
+from utils.dictionary import Dictionary
+from utils.parsing import PageParser
+
 class Driver:
     @staticmethod
     def get_driver(headless=False):
@@ -38,11 +46,79 @@ class Driver:
         driver.refresh()
         print("[INFO] Cookies injected and page refreshed")
 
+class DriverPool:
+    """Lazily started pool of Chrome drivers shared by concurrent fetch threads.
+
+    Drivers are created on demand up to ``size`` and handed out one per
+    caller; pair it with a shared ``RateLimiter`` to cap the request rate.
+    """
+
+    def __init__(self, size, headless=False, setup=None):
+        self.size = max(1, int(size))
+        self.headless = headless
+        self.setup = setup
+        self._idle = queue.LifoQueue()
+        self._drivers = []
+        self._reserved = 0
+        self._lock = threading.Lock()
+        self._create_lock = threading.Lock()
+
+    def _create(self):
+        try:
+            # undetected_chromedriver patches its binary on start, so never start two at once
+            with self._create_lock:
+                driver = Driver.get_driver(headless=self.headless)
+                if self.setup:
+                    self.setup(driver)
+        except Exception:
+            with self._lock:
+                self._reserved -= 1
+            raise
+        with self._lock:
+            self._drivers.append(driver)
+        return driver
+
+    @contextmanager
+    def driver(self):
+        try:
+            driver = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._reserved < self.size
+                if can_create:
+                    self._reserved += 1
+            driver = self._create() if can_create else self._idle.get()
+        try:
+            yield driver
+        finally:
+            self._idle.put(driver)
+
+    @property
+    def started(self):
+        with self._lock:
+            return len(self._drivers)
+
+    def quit(self):
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+            self._reserved = 0
+        self._idle = queue.LifoQueue()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
 class HTMLUtils:
     _last_team_line_points = None
+    _wdl_re = re.compile(r"^\s*(\d+)\s*/\s*(\d+)\s*/\s*(\d+)\s*$")
+    _map_code_re = re.compile(r"/map/(\d+)/")
 
     @staticmethod
     def get_team_line_expanded(html):
+        if isinstance(html, str):
+            html = PageParser.parse(html, PageParser.TEAM_LINE)
         item = html.find(class_='teamLineExpanded')
         fallback_value = HTMLUtils._last_team_line_points if HTMLUtils._last_team_line_points is not None else 0
         if item is None:
@@ -69,4 +145,66 @@ class HTMLUtils:
                 return fallback_value
 
         HTMLUtils._last_team_line_points = pts
-        return pts
\ No newline at end of file
+        return pts
+
+    @staticmethod
+    def _parse_points(points_node):
+        # "(1946 points)" -> 1946
+        return int(points_node.text.split(' ')[0].split('(')[1])
+
+    @staticmethod
+    def get_ranking_points(html):
+        """Parse a full valve ranking page into ``{team_id: points}``."""
+        ranking = {}
+        teams = html.find_all(class_='ranked-team')
+        if teams:
+            pairs = [(team.find(class_='moreLink'), team.find(class_='points')) for team in teams]
+        else:
+            pairs = zip(html.find_all(class_='moreLink'), html.find_all(class_='points'))
+
+        for link, points_node in pairs:
+            if link is None or points_node is None or not link.get('href'):
+                continue
+            try:
+                ranking[link['href'].split('/')[-2]] = HTMLUtils._parse_points(points_node)
+            except (ValueError, IndexError):
+                logging.warning("[WARN] Unexpected 'points' format in ranking table; skipping team.")
+        return ranking
+
+    @staticmethod
+    def points_for_team(ranking, team_id):
+        """Look a team up in a ranking snapshot; unranked teams sit one point below the last team."""
+        team_id = str(team_id)
+        if team_id in ranking:
+            return ranking[team_id]
+        return min(ranking.values()) - 1 if ranking else 0
+
+    @staticmethod
+    def get_team_map_winrates(html):
+        """Parse a team's ``stats/teams/maps`` overview into ``{map_name: winrate}``.
+
+        Maps the team has not played in the window are left out.
+        """
+        code_to_map = {code: name for name, code in Dictionary.map_team_dict.items()}
+        winrates = {}
+        for holder in html.find_all(class_='map-pool-map-holder'):
+            map_name = None
+            code = HTMLUtils._map_code_re.search(holder.get('href', ''))
+            if code:
+                map_name = code_to_map.get(int(code.group(1)))
+            if map_name is None:
+                name_node = holder.find(class_='map-pool-map-name')
+                map_name = name_node.text.split(' - ')[0].strip() if name_node else None
+            if map_name is None:
+                continue
+
+            rows = holder.find_next_sibling(class_='stats-rows') or holder.find_next(class_='stats-rows')
+            if rows is None:
+                continue
+            for span in rows.find_all('span'):
+                wdl = HTMLUtils._wdl_re.match(span.text)
+                if wdl:
+                    w, d, l = map(int, wdl.groups())
+                    winrates[map_name] = 0 if (w + d + l) == 0 else round(w / (w + d + l) * 100, 1)
+                    break
+        return winrates
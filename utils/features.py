@@ -0,0 +1,180 @@
+import hashlib
+import os
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from utils.storage import MatchStore
+
+# Column order the model is trained and served with
+FEATURE_COLUMNS = [
+    'team1_valve_points', 'team2_valve_points',
+    'team1_win_rate', 'team2_win_rate',
+    'team1_map_win_rate', 'team2_map_win_rate',
+    'team1_h2h_winrate', 'team2_h2h_winrate',
+    'team1_recent_wins', 'team2_recent_wins',
+    'team1_avg_rating', 'team1_avg_kd',
+    'team2_avg_rating', 'team2_avg_kd',
+]
+
+TEAMS = ('team1', 'team2')
+
+
+class Features:
+    """Turn match records (the ``hltv_data.jsonl`` layout) into model inputs.
+
+    The trainer and the GUI both featurize through here, so a match always
+    maps to the same row. Missing values, and teams without player stats,
+    become 0.0.
+    """
+
+    @staticmethod
+    def _number(value):
+        return 0.0 if value is None else float(value)
+
+    @staticmethod
+    def build_feature_matrix(matches):
+        """Return an ``(n, len(FEATURE_COLUMNS))`` float array for ``matches``."""
+        matches = list(matches)
+        n = len(matches)
+        num = Features._number
+
+        scalars = np.array([
+            [num(m[team].get(field)) for field in ('valve_points', 'win_rate', 'map_win_rate') for team in TEAMS]
+            + [num(m.get('head_to_head', {}).get(f'{team}_winrate')) for team in TEAMS]
+            + [sum(1 for r in m[team].get('recent_matches') or () if r == 'W') for team in TEAMS]
+            for m in matches
+        ], dtype=np.float64).reshape(n, 10)
+
+        # Flatten every player stat row once; segment 2*i + t is team t of match i
+        per_team = [
+            [stat for player in m[team].get('players') or () for stat in player.get('stats') or ()]
+            for m in matches for team in TEAMS
+        ]
+        flat = list(chain.from_iterable(per_team))
+        segments = np.repeat(np.arange(2 * n), [len(stats) for stats in per_team])
+        ratings = [stat.get('rating2.0') for stat in flat]
+        kds = [stat.get('kd') for stat in flat]
+
+        averages = []
+        for values in (ratings, kds):
+            values = np.asarray(values, dtype=np.float64)
+            present = ~np.isnan(values)
+            totals = np.bincount(segments[present], weights=values[present], minlength=2 * n)
+            counts = np.bincount(segments[present], minlength=2 * n)
+            averages.append(np.divide(totals, counts, out=np.zeros(2 * n), where=counts > 0).reshape(n, 2))
+        avg_rating, avg_kd = averages
+
+        player_cols = np.column_stack([avg_rating[:, 0], avg_kd[:, 0], avg_rating[:, 1], avg_kd[:, 1]])
+        return np.hstack([scalars, player_cols])
+
+    @staticmethod
+    def build_feature_frame(matches):
+        """Same as ``build_feature_matrix`` but with named columns, as the model was fitted on."""
+        return pd.DataFrame(Features.build_feature_matrix(matches), columns=FEATURE_COLUMNS)
+
+    @staticmethod
+    def labels(matches):
+        return np.array([1 if m['result'] == 'team1' else 0 for m in matches], dtype=np.int8)
+
+
+class FeatureCache:
+    """Feature matrix for a match data file, cached next to it as ``.npz``.
+
+    The cache remembers how many bytes of the source it has featurized and
+    a sha256 of those bytes. If the file only grew (new JSON Lines appended),
+    just the new lines are read and featurized; any other change to the
+    source, or to ``FEATURE_COLUMNS``, rebuilds it from scratch.
+    """
+
+    VERSION = 1
+
+    def __init__(self, source_path, cache_path=None):
+        self.source_path = source_path
+        self.cache_path = cache_path or os.path.splitext(source_path)[0] + ".features.npz"
+        self.rebuilt = False
+        self.added = 0
+        # Bytes of the source covered by the last load(), and their sha256
+        self.offset = 0
+        self.sha256 = None
+
+    @staticmethod
+    def _dates(matches):
+        return np.array([m.get('date') or 'NaT' for m in matches], dtype='datetime64[D]')
+
+    def _hash_prefix(self, length):
+        digest = hashlib.sha256()
+        with open(self.source_path, "rb") as f:
+            remaining = length
+            while remaining > 0:
+                block = f.read(min(remaining, 1 << 20))
+                if not block:
+                    break
+                digest.update(block)
+                remaining -= len(block)
+        return digest
+
+    def matches_prefix(self, offset, sha256):
+        """True if the first ``offset`` bytes of the source still hash to ``sha256``."""
+        if offset > os.path.getsize(self.source_path):
+            return False
+        return self._hash_prefix(offset).hexdigest() == sha256
+
+    def _is_legacy_list(self):
+        with open(self.source_path, "rb") as f:
+            return f.read(64).lstrip()[:1] == b"["
+
+    def _read_cache(self):
+        try:
+            with np.load(self.cache_path, allow_pickle=False) as cached:
+                if int(cached["version"]) != self.VERSION or list(cached["columns"]) != FEATURE_COLUMNS:
+                    return None
+                return {key: cached[key] for key in cached.files}
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def _write_cache(self, X, y, dates, offset, digest):
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(f, X=X, y=y, dates=dates, columns=np.array(FEATURE_COLUMNS), offset=np.int64(offset),
+                     sha256=np.array(digest.hexdigest()), version=np.int64(self.VERSION))
+        os.replace(tmp_path, self.cache_path)
+        self.offset, self.sha256 = offset, digest.hexdigest()
+
+    def load(self):
+        """Return ``(X, y, dates)`` for every match in the source file."""
+        size = os.path.getsize(self.source_path)
+        cached = self._read_cache()
+
+        if cached is not None:
+            offset = int(cached["offset"])
+            if offset <= size:
+                digest = self._hash_prefix(offset)
+                if digest.hexdigest() == str(cached["sha256"]):
+                    if offset == size:
+                        self.offset, self.sha256 = offset, digest.hexdigest()
+                        return cached["X"], cached["y"], cached["dates"]
+                    if not self._is_legacy_list():
+                        matches, end = MatchStore.read_from(self.source_path, offset)
+                        with open(self.source_path, "rb") as f:
+                            f.seek(offset)
+                            digest.update(f.read(end - offset))
+                        X = np.vstack([cached["X"], Features.build_feature_matrix(matches)])
+                        y = np.concatenate([cached["y"], Features.labels(matches)])
+                        dates = np.concatenate([cached["dates"], self._dates(matches)])
+                        self._write_cache(X, y, dates, end, digest)
+                        self.added = len(matches)
+                        return X, y, dates
+
+        self.rebuilt = True
+        if self._is_legacy_list():
+            matches, end = list(MatchStore.iter_matches(self.source_path)), size
+        else:
+            matches, end = MatchStore.read_from(self.source_path, 0)
+        X = Features.build_feature_matrix(matches)
+        y = Features.labels(matches)
+        dates = self._dates(matches)
+        self._write_cache(X, y, dates, end, self._hash_prefix(end))
+        self.added = len(matches)
+        return X, y, dates
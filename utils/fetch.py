@@ -0,0 +1,238 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.ratelimit import RateLimiter
+
+
+class PageMemo:
+    """Bounded LRU of fetched page HTML keyed by URL, shared by every extractor in one run.
+
+    The first caller for a URL downloads it; callers that ask for
+    the same URL while that is in progress wait for it instead of fetching it
+    again. Failed fetches (``None``) are not remembered. ``avoided`` counts the
+    page loads that were served from the memo.
+    """
+
+    def __init__(self, max_pages=32):
+        self.max_pages = max(1, int(max_pages))
+        self.pages = OrderedDict()
+        self.avoided = 0
+        self.loaded = 0
+        self._lock = threading.Lock()
+        self._inflight = {}
+
+    def get_or_fetch(self, url, fetch_fn):
+        while True:
+            with self._lock:
+                if url in self.pages:
+                    self.pages.move_to_end(url)
+                    self.avoided += 1
+                    return self.pages[url]
+                pending = self._inflight.get(url)
+                if pending is None:
+                    pending = self._inflight[url] = threading.Event()
+                    break
+            # Served from the memo on the next pass, or fetched here if the other load failed
+            pending.wait()
+
+        page = None
+        try:
+            page = fetch_fn()
+        finally:
+            # Store the page before waking waiters, so none of them finds neither entry nor marker
+            with self._lock:
+                if page is not None:
+                    self.loaded += 1
+                    self.pages[url] = page
+                    self.pages.move_to_end(url)
+                    while len(self.pages) > self.max_pages:
+                        self.pages.popitem(last=False)
+                self._inflight.pop(url).set()
+        return page
+
+    def clear(self):
+        """Drop every page and reset the counters, e.g. at the start of a new prediction."""
+        with self._lock:
+            self.pages.clear()
+            self.avoided = 0
+            self.loaded = 0
+
+
+class FetchStats:
+    """Per-backend page load latency, plus how often ``auto`` had to escalate to the browser."""
+
+    def __init__(self):
+        self.backends = {}
+        self.escalations = 0
+        self._lock = threading.Lock()
+
+    def record(self, backend, seconds):
+        with self._lock:
+            entry = self.backends.setdefault(backend, {"count": 0, "total_s": 0.0, "max_s": 0.0})
+            entry["count"] += 1
+            entry["total_s"] += seconds
+            entry["max_s"] = max(entry["max_s"], seconds)
+
+    def escalated(self):
+        with self._lock:
+            self.escalations += 1
+
+    def summary(self):
+        with self._lock:
+            parts = [
+                f"{backend}: {entry['count']} loads, avg {entry['total_s'] / entry['count'] * 1000:.0f} ms, "
+                f"max {entry['max_s'] * 1000:.0f} ms"
+                for backend, entry in sorted(self.backends.items())
+            ]
+            if self.escalations:
+                parts.append(f"{self.escalations} escalated to browser")
+        return "; ".join(parts) or "no page loads"
+
+
+class HttpFetcher:
+    """Plain HTTP page loads on one pooled ``requests.Session``.
+
+    Sends the same user agent as the Chrome driver and the cookies from
+    ``cookie_file`` (the ``config/cookies.json`` format), so a fresh
+    ``cf_clearance`` cookie lets most stats pages through without a browser.
+    """
+
+    USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/136.0.0.0 Safari/537.36")
+
+    def __init__(self, cookie_file=None, pool_size=8, timeout=20):
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update({
+            "User-Agent": self.USER_AGENT,
+            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+            "Accept-Language": "en-US,en;q=0.9",
+        })
+        if cookie_file:
+            self.load_cookies(cookie_file)
+
+    def load_cookies(self, cookie_file):
+        if not os.path.exists(cookie_file):
+            print("[WARN] Cookie file not found")
+            return 0
+        with open(cookie_file, "r") as f:
+            cookies = json.load(f)
+        for cookie in cookies:
+            if cookie.get("value"):
+                self.session.cookies.set(cookie["name"], cookie["value"],
+                                         domain=cookie.get("domain", ""), path=cookie.get("path", "/"))
+        return len(cookies)
+
+    def get(self, url):
+        """Return the response body, or ``None`` on network errors and non-challenge HTTP errors."""
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except requests.RequestException as e:
+            print(f"[WARN] HTTP fetch failed for {url}: {e}")
+            return None
+        # Cloudflare serves its challenge with 403/503, so keep those bodies for detection
+        if response.ok or RateLimiter.is_challenge(response.text):
+            return response.text
+        print(f"[WARN] HTTP {response.status_code} for {url}")
+        return None
+
+    def close(self):
+        self.session.close()
+
+
+class PageFetcher:
+    """Load page HTML through the configured backend.
+
+    - ``browser``: every page through Chrome (``browser_get``)
+    - ``http``: every page through ``HttpFetcher``
+    - ``auto``: HTTP first, escalating to Chrome only when HTTP fails or
+      returns a Cloudflare challenge page; after ``escalate_after`` challenges
+      in a row, Chrome for the rest of the session
+    - ``archive``: offline; pages come only from ``archive`` (``PageArchive``)
+
+    With an ``archive`` set, every page fetched from the network is also
+    stored in it. Each network request takes a token from ``limiter`` and reports challenges back to
+    it; a page that is still challenged after ``max_retries`` attempts gives
+    ``None``. ``on_challenge(url, attempt)`` is called before each retry.
+    """
+
+    BACKENDS = ("auto", "http", "browser", "archive")
+
+    def __init__(self, backend="auto", http=None, limiter=None, max_retries=3, on_challenge=None, archive=None,
+                 escalate_after=3):
+        self.backend = backend if backend in self.BACKENDS else "auto"
+        self.http = http
+        self.archive = archive
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.on_challenge = on_challenge
+        self.escalate_after = escalate_after
+        self.stats = FetchStats()
+        self._http_challenges = 0
+        self._lock = threading.Lock()
+
+    def _timed(self, backend, get, url):
+        start = time.perf_counter()
+        try:
+            return get(url)
+        finally:
+            self.stats.record(backend, time.perf_counter() - start)
+
+    def _request(self, backend, get, url, report=True):
+        if self.limiter is not None:
+            self.limiter.acquire()
+        html = self._timed(backend, get, url)
+        if self.limiter is not None and report:
+            self.limiter.report(RateLimiter.is_challenge(html))
+        return html
+
+    def _use_http(self):
+        if self.backend == "browser" or self.http is None:
+            return False
+        with self._lock:
+            return self.backend == "http" or self._http_challenges < self.escalate_after
+
+    def _load(self, url, browser_get):
+        if self._use_http():
+            # In auto mode an HTTP challenge means missing clearance, not too high a rate; Chrome handles it
+            html = self._request("http", self.http.get, url, report=self.backend == "http")
+            if self.backend == "http":
+                return html
+            challenged = RateLimiter.is_challenge(html)
+            if html is not None and not challenged:
+                with self._lock:
+                    self._http_challenges = 0
+                return html
+            self.stats.escalated()
+            if challenged:
+                with self._lock:
+                    self._http_challenges += 1
+                    sticky = self._http_challenges == self.escalate_after
+                if sticky:
+                    print(f"[WARN] {self.escalate_after} HTTP challenges in a row; using the browser for the rest of the session")
+        return self._request("browser", browser_get, url)
+
+    def fetch(self, url, browser_get):
+        """Return the page HTML, or ``None``. ``browser_get(url)`` loads it in Chrome."""
+        if self.backend == "archive":
+            return self._timed("archive", self.archive.get, url) if self.archive is not None else None
+
+        for attempt in range(1, self.max_retries + 1):
+            html = self._load(url, browser_get)
+            challenged = RateLimiter.is_challenge(html)
+            if not challenged:
+                if html is not None and self.archive is not None:
+                    self.archive.put(url, html)
+                return html
+            if self.on_challenge:
+                self.on_challenge(url, attempt)
+        return None
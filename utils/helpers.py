@@ -108,6 +108,16 @@ class Cache:
             hours = default_expiry_value
         return hours
 
+    @staticmethod
+    def normalize_cache_limit(limit_value, default_limit_value=0):
+        try:
+            limit = int(limit_value)
+            if limit < 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            limit = default_limit_value
+        return limit
+
     @staticmethod
     def validate_cache_db_path(path, default_cache_db, base_dir):
         candidate = os.path.abspath(path) if path else default_cache_db
@@ -138,15 +148,34 @@ class Settings:
         return os.path.join(directory, path)
 
     @staticmethod
-    def get_active_settings(ceh, cdb, mdir, headless=False, theme="system"):
+    def get_active_settings(ceh, cdb, mdir, headless=False, theme="system", cme=0, cmm=0, pool_size=1, backend="auto"):
         return {
             "cache_expiry_hours": ceh,
+            "cache_max_entries": cme,
+            "cache_max_mb": cmm,
             "cache_db_path": cdb,
             "model_path": mdir,
             "headless": headless,
+            "driver_pool_size": pool_size,
+            "fetch_backend": backend,
             "theme": _normalize_theme_preference(theme),
         }
 
+    @staticmethod
+    def normalize_pool_size(value, default=1, maximum=8):
+        try:
+            size = int(value)
+            if size <= 0:
+                raise ValueError
+        except (TypeError, ValueError):
+            size = default
+        return min(size, maximum)
+
+    @staticmethod
+    def normalize_fetch_backend(value, default="auto"):
+        backend = str(value).strip().lower() if value is not None else ""
+        return backend if backend in {"auto", "http", "browser", "archive"} else default
+
     @staticmethod
     def normalize_theme(preference: str, default: str = "system") -> str:
         return _normalize_theme_preference(preference, default)
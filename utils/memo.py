@@ -0,0 +1,79 @@
+import sqlite3
+import threading
+
+from utils.serialization import CacheCodec
+
+
+class SessionMemo:
+    """Memoize sub-fetch results for one scrape run.
+
+    Keys are built from (kind, entity, map, date window), so a team's or
+    player's page is only downloaded once per window however many matches it
+    appears in. With ``db_path`` set, results are also kept in a small SQLite
+    table that later runs and other worker processes read from.
+
+    A fetch that returns ``None`` has failed (challenge, missing page, parse
+    error): it isn't memoized, so the next caller tries again, and
+    ``get_or_fetch`` hands back ``default`` instead.
+    """
+
+    def __init__(self, db_path=None):
+        self.values = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.conn = None
+        if db_path:
+            self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS memo (key TEXT PRIMARY KEY, value BLOB, codec TEXT)")
+            self.conn.commit()
+
+    @staticmethod
+    def key(kind, entity, map_code="", window=()):
+        return "::".join([kind, str(entity), str(map_code), *window])
+
+    def _load(self, key):
+        if self.conn is None:
+            return False, None
+        row = self.conn.execute("SELECT value, codec FROM memo WHERE key=?", (key,)).fetchone()
+        if row is None:
+            return False, None
+        return True, CacheCodec.decode(row[1], row[0])
+
+    def _store(self, key, value):
+        if self.conn is None:
+            return
+        codec, blob = CacheCodec.encode(value)
+        self.conn.execute("REPLACE INTO memo (key, value, codec) VALUES (?, ?, ?)", (key, blob, codec))
+        self.conn.commit()
+
+    def get_or_fetch(self, key, fetch_fn, default=None):
+        with self._lock:
+            if key in self.values:
+                self.hits += 1
+                return self.values[key]
+            found, value = self._load(key)
+            if found:
+                self.hits += 1
+                self.values[key] = value
+                return value
+
+        value = fetch_fn()
+        with self._lock:
+            self.misses += 1
+            if value is None:
+                return default
+            self.values[key] = value
+            self._store(key, value)
+        return value
+
+    def put(self, key, value):
+        with self._lock:
+            self.values[key] = value
+            self._store(key, value)
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
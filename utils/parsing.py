@@ -0,0 +1,34 @@
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+
+def _class_token(*names):
+    # SoupStrainer matches class_ strings against the whole attribute, so match any one token like find() does
+    return re.compile(r"(^|\s)(" + "|".join(map(re.escape, names)) + r")(\s|$)")
+
+
+class PageParser:
+    """Parse fetched HTML, optionally keeping only the nodes an extractor reads.
+
+    Uses lxml when it is installed and falls back to ``html.parser``. Passing
+    one of the strainers below as ``only`` builds just that subtree instead of
+    the whole page, which is most of the parse time and memory on HLTV pages.
+    """
+
+    PARSER = PARSER
+
+    STATS_TABLE = SoupStrainer(class_=_class_token("stats-table"))
+    LARGE_STRONG = SoupStrainer(class_=_class_token("large-strong"))
+    HEAD_TO_HEAD = SoupStrainer(class_=_class_token("head-to-head"))
+    TEAM_LINE = SoupStrainer(class_=_class_token("teamLineExpanded", "points"))
+
+    @staticmethod
+    def parse(html, only=None):
+        return BeautifulSoup(html, PageParser.PARSER, parse_only=only)
@@ -0,0 +1,106 @@
+import multiprocessing
+import random
+import threading
+import time
+
+
+class RateLimiter:
+    """Token-bucket limiter shared by every fetcher in a thread or process group.
+
+    ``rate`` tokens per second refill a bucket holding up to ``burst`` tokens;
+    each request takes one. A little random ``jitter`` is added so requests do
+    not line up. When a Cloudflare challenge page is reported the effective
+    rate is halved (down to ``1 / max_penalty``) and all callers pause for a
+    backoff that grows with the penalty; clean responses slowly restore it.
+
+    Pass ``shared=RateLimiter.shared_state()`` (created in the parent and
+    handed to worker processes) to share one budget across processes.
+    """
+
+    # State slots: tokens, last refill, penalty factor, paused-until
+    _TOKENS, _UPDATED, _PENALTY, _PAUSED = range(4)
+
+    CHALLENGE_MARKERS = (
+        "<title>just a moment...</title>",
+        "cf-challenge",
+        "challenge-platform",
+        "cf_chl_",
+        "attention required! | cloudflare",
+    )
+
+    def __init__(self, rate, burst=1, jitter=0.0, backoff=30.0, max_penalty=16.0, recovery=0.9, shared=None):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self.jitter = jitter
+        self.backoff = backoff
+        self.max_penalty = max_penalty
+        self.recovery = recovery
+        if shared is None:
+            self._lock = threading.Lock()
+            self._state = [self.burst, time.monotonic(), 1.0, 0.0]
+        else:
+            self._lock, self._state = shared
+            with self._lock:
+                if self._state[self._PENALTY] == 0:
+                    self._state[:] = [self.burst, time.monotonic(), 1.0, 0.0]
+
+    @staticmethod
+    def shared_state():
+        """Lock and state array to pass to worker processes (via initializer args)."""
+        return multiprocessing.Lock(), multiprocessing.RawArray("d", 4)
+
+    @staticmethod
+    def is_challenge(html):
+        if not html:
+            return False
+        head = html[:20000].lower()
+        return any(marker in head for marker in RateLimiter.CHALLENGE_MARKERS)
+
+    def acquire(self):
+        """Block until a request may be sent; returns the seconds spent waiting."""
+        if self.rate <= 0:
+            return 0.0
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                state = self._state
+                now = time.monotonic()
+                rate = self.rate / state[self._PENALTY]
+                state[self._TOKENS] = min(self.burst, state[self._TOKENS] + (now - state[self._UPDATED]) * rate)
+                state[self._UPDATED] = now
+
+                if now < state[self._PAUSED]:
+                    wait = state[self._PAUSED] - now
+                elif state[self._TOKENS] >= 1:
+                    state[self._TOKENS] -= 1
+                    wait = 0.0
+                else:
+                    wait = (1 - state[self._TOKENS]) / rate
+
+            if wait <= 0:
+                break
+            time.sleep(wait)
+            waited += wait
+
+        if self.jitter:
+            extra = random.uniform(0, self.jitter)
+            time.sleep(extra)
+            waited += extra
+        return waited
+
+    def report(self, challenged):
+        """Feed back whether the last response was a challenge page."""
+        with self._lock:
+            state = self._state
+            if challenged:
+                state[self._PENALTY] = min(self.max_penalty, state[self._PENALTY] * 2)
+                state[self._PAUSED] = time.monotonic() + self.backoff * state[self._PENALTY]
+                state[self._TOKENS] = 0.0
+            else:
+                state[self._PENALTY] = max(1.0, state[self._PENALTY] * self.recovery)
+
+    @property
+    def penalty(self):
+        with self._lock:
+            return self._state[self._PENALTY]
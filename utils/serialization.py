@@ -0,0 +1,89 @@
+import json
+import pickle
+import struct
+
+
+class CacheCodec:
+    """Encode cache values with the most compact codec that round-trips them exactly.
+
+    Tags are stored next to each row so old rows (tag ``NULL``) keep decoding
+    as pickle:
+
+    - ``stats``: lists of ``{"rating2.0", "kd", "map"}`` player rows packed as
+      int16 hundredths plus an index into a small map-name table
+    - ``json``: scalars, lists and str-keyed dicts
+    - ``pickle``: anything else
+    """
+
+    STATS = "stats"
+    JSON = "json"
+    PICKLE = "pickle"
+
+    _STAT_KEYS = {"rating2.0", "kd", "map"}
+    _STAT_ROW = struct.Struct("<hhB")
+    _COUNT = struct.Struct("<H")
+
+    @staticmethod
+    def encode(value):
+        """Return ``(codec, blob)`` for ``value``."""
+        if CacheCodec._is_stat_rows(value):
+            try:
+                blob = CacheCodec._pack_stats(value)
+                if CacheCodec._unpack_stats(blob) == value:
+                    return CacheCodec.STATS, blob
+            except (struct.error, ValueError, OverflowError):
+                pass
+
+        try:
+            text = json.dumps(value, separators=(",", ":"), allow_nan=False)
+            if json.loads(text) == value:
+                return CacheCodec.JSON, text.encode("utf-8")
+        except (TypeError, ValueError):
+            pass
+
+        return CacheCodec.PICKLE, pickle.dumps(value)
+
+    @staticmethod
+    def decode(codec, blob):
+        if codec == CacheCodec.STATS:
+            return CacheCodec._unpack_stats(blob)
+        if codec == CacheCodec.JSON:
+            return json.loads(blob)
+        return pickle.loads(blob)
+
+    @staticmethod
+    def _is_stat_rows(value):
+        return (
+            isinstance(value, list)
+            and len(value) > 0
+            and all(isinstance(row, dict) and row.keys() == CacheCodec._STAT_KEYS for row in value)
+        )
+
+    @staticmethod
+    def _pack_stats(rows):
+        names = sorted({row["map"] for row in rows})
+        if len(names) > 255:
+            raise ValueError("too many map names")
+        index = {name: i for i, name in enumerate(names)}
+        name_blob = "\x00".join(names).encode("utf-8")
+
+        parts = [CacheCodec._COUNT.pack(len(name_blob)), name_blob, CacheCodec._COUNT.pack(len(rows))]
+        for row in rows:
+            parts.append(CacheCodec._STAT_ROW.pack(
+                round(row["rating2.0"] * 100), round(row["kd"] * 100), index[row["map"]]
+            ))
+        return b"".join(parts)
+
+    @staticmethod
+    def _unpack_stats(blob):
+        (name_len,) = CacheCodec._COUNT.unpack_from(blob, 0)
+        offset = CacheCodec._COUNT.size
+        names = blob[offset:offset + name_len].decode("utf-8").split("\x00")
+        offset += name_len
+        (count,) = CacheCodec._COUNT.unpack_from(blob, offset)
+        offset += CacheCodec._COUNT.size
+
+        rows = []
+        for rating, kd, map_idx in CacheCodec._STAT_ROW.iter_unpack(blob[offset:offset + count * CacheCodec._STAT_ROW.size]):
+            rows.append({"rating2.0": rating / 100, "kd": kd / 100, "map": names[map_idx]})
+        return rows
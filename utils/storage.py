@@ -0,0 +1,238 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import time
+
+
+class MatchStore:
+    """Append-only JSON Lines store for scraped match records.
+
+    Every record is written as a single line with one ``write`` call and
+    fsync'd before returning, so appending is O(1) and a crash can at worst
+    leave a truncated final line (which readers skip).
+    """
+
+    @staticmethod
+    def append(path, record):
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        if MatchStore._has_partial_tail(path):
+            # A previous write was cut short; start on a fresh line so only that record is lost
+            line = "\n" + line
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line.encode("utf-8"))
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _has_partial_tail(path):
+        try:
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return False
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) != b"\n"
+        except FileNotFoundError:
+            return False
+
+    @staticmethod
+    def iter_matches(path):
+        """Yield match records one at a time.
+
+        Legacy ``hltv_data.json`` files (a single JSON list) are still
+        readable, but are loaded in one go.
+        """
+        with open(path, "r", encoding="utf-8") as f:
+            first = f.read(1)
+            while first and first.isspace():
+                first = f.read(1)
+            f.seek(0)
+
+            if first == "[":
+                data = json.load(f)
+                if not isinstance(data, list):
+                    raise ValueError(f"{path} should contain a list of matches")
+                yield from data
+                return
+
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logging.warning(f"[WARN] Skipping unreadable record at {path}:{line_no}")
+                    print(f"[WARN] Skipping unreadable record at {path}:{line_no}")
+
+    @staticmethod
+    def read_from(path, offset=0):
+        """Return ``(records, end)`` for the complete lines after byte ``offset``.
+
+        ``end`` is the offset just past the last complete line, so a record
+        still being written is picked up by the next call instead.
+        """
+        with open(path, "rb") as f:
+            f.seek(offset)
+            chunk = f.read()
+        end = chunk.rfind(b"\n") + 1
+        records = []
+        for line in chunk[:end].splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                logging.warning(f"[WARN] Skipping unreadable record in {path} after byte {offset}")
+                print(f"[WARN] Skipping unreadable record in {path} after byte {offset}")
+        return records, offset + end
+
+    @staticmethod
+    def resolve_path(path):
+        """Return ``path`` if it exists, otherwise the legacy ``.json`` sibling."""
+        if os.path.exists(path):
+            return path
+        legacy = os.path.splitext(path)[0] + ".json"
+        if os.path.exists(legacy):
+            return legacy
+        return path
+
+    @staticmethod
+    def migrate_legacy(json_path, jsonl_path):
+        """Convert a legacy JSON list file into the JSON Lines store."""
+        if os.path.exists(jsonl_path) or not os.path.exists(json_path):
+            return False
+
+        tmp_path = jsonl_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as out:
+            for record in MatchStore.iter_matches(json_path):
+                out.write(json.dumps(record, separators=(",", ":")) + "\n")
+            out.flush()
+            os.fsync(out.fileno())
+        os.replace(tmp_path, jsonl_path)
+        return True
+
+
+class ProcessedMatches:
+    """Persistent set of scraped match URLs keyed by HLTV match ID.
+
+    IDs live in a SQLite table and are mirrored into an in-memory set when
+    the registry is opened, so membership checks are O(1) and each new match
+    is a single insert. Several scraper processes can share one registry:
+    ``claim`` is an atomic insert, so only one of them gets each match. A
+    claim only becomes final with ``finish``; one left behind by a killed
+    process is taken over once it is ``CLAIM_TIMEOUT_S`` old.
+    """
+
+    _ID_RE = re.compile(r"/(\d+)(?:/|$)")
+    CLAIM_TIMEOUT_S = 30 * 60
+
+    def __init__(self, db_path, legacy_path=None):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS processed_matches (match_id TEXT PRIMARY KEY, url TEXT, timestamp REAL, "
+            "done INTEGER NOT NULL DEFAULT 1)"
+        )
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(processed_matches)")}
+        if "done" not in columns:
+            # Registries from before claims existed only hold finished matches
+            self.conn.execute("ALTER TABLE processed_matches ADD COLUMN done INTEGER NOT NULL DEFAULT 1")
+        self.conn.commit()
+        if legacy_path:
+            self._import_legacy(legacy_path)
+        self.ids = {row[0] for row in self.conn.execute("SELECT match_id FROM processed_matches WHERE done=1")}
+
+    @staticmethod
+    def match_id(url):
+        """Return the numeric HLTV ID in ``url`` (falls back to the URL itself)."""
+        path = url.split("?")[0]
+        found = ProcessedMatches._ID_RE.search(path)
+        return found.group(1) if found else path
+
+    def _import_legacy(self, legacy_path):
+        if not os.path.exists(legacy_path):
+            return
+        (count,) = self.conn.execute("SELECT COUNT(*) FROM processed_matches").fetchone()
+        if count:
+            return
+
+        with open(legacy_path, "r") as f:
+            urls = json.load(f)
+        ts = time.time()
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO processed_matches (match_id, url, timestamp) VALUES (?, ?, ?)",
+            [(self.match_id(url), url, ts) for url in urls],
+        )
+        self.conn.commit()
+        logging.info(f"[INFO] Imported {len(urls)} processed matches from {legacy_path}")
+        print(f"[INFO] Imported {len(urls)} processed matches from {legacy_path}")
+
+    def __contains__(self, url):
+        return self.match_id(url) in self.ids
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, url):
+        match_id = self.match_id(url)
+        if match_id in self.ids:
+            return
+        self.conn.execute(
+            "INSERT OR IGNORE INTO processed_matches (match_id, url, timestamp) VALUES (?, ?, ?)",
+            (match_id, url, time.time()),
+        )
+        self.conn.commit()
+        self.ids.add(match_id)
+
+    def claim(self, url):
+        """Atomically mark ``url`` as being scraped; returns False if it's done or another process has it."""
+        match_id = self.match_id(url)
+        if match_id in self.ids:
+            return False
+        now = time.time()
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO processed_matches (match_id, url, timestamp, done) VALUES (?, ?, ?, 0)",
+            (match_id, url, now),
+        )
+        if cursor.rowcount != 1:
+            cursor = self.conn.execute(
+                "UPDATE processed_matches SET url=?, timestamp=? WHERE match_id=? AND done=0 AND timestamp<?",
+                (url, now, match_id, now - self.CLAIM_TIMEOUT_S),
+            )
+        self.conn.commit()
+        return cursor.rowcount == 1
+
+    def finish(self, url):
+        """Make a ``claim`` final once the match's record is written."""
+        match_id = self.match_id(url)
+        self.conn.execute("UPDATE processed_matches SET done=1 WHERE match_id=?", (match_id,))
+        self.conn.commit()
+        self.ids.add(match_id)
+
+    def release(self, url):
+        """Undo a ``claim`` for a match that could not be scraped."""
+        match_id = self.match_id(url)
+        self.conn.execute("DELETE FROM processed_matches WHERE match_id=? AND done=0", (match_id,))
+        self.conn.commit()
+
+    def filter_new(self, urls):
+        """Return the URLs from ``urls`` that have not been processed, in order."""
+        seen = set()
+        new_urls = []
+        for url in urls:
+            match_id = self.match_id(url)
+            if match_id in self.ids or match_id in seen:
+                continue
+            seen.add(match_id)
+            new_urls.append(url)
+        return new_urls
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,119 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+class Task:
+    def __init__(self, key, fn, args=(), deps=(), then=None):
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.deps = tuple(deps)
+        self.then = then
+        self.result = None
+        self.done = False
+        self.cached = False
+        self.duration = 0.0
+
+
+class TaskGraph:
+    """Dependency graph of fetch tasks run in parallel on a worker pool.
+
+    Tasks are keyed (usually by cache key / URL), so adding the same key twice
+    is a no-op. Results that are already known (cache hits) are added with
+    ``add_result`` and never run; values derived from another task's result
+    can be added the same way with ``cached=False`` so they still count as
+    fetched. A task's ``then`` callback runs on the
+    coordinating thread once the task finishes and may add child tasks.
+    """
+
+    def __init__(self):
+        self.tasks = {}
+        self._lock = threading.Lock()
+        self.wall_time = 0.0
+
+    def add(self, key, fn, args=(), deps=(), then=None):
+        with self._lock:
+            if key not in self.tasks:
+                self.tasks[key] = Task(key, fn, args, deps, then)
+        return key
+
+    def add_result(self, key, value, cached=True):
+        with self._lock:
+            task = self.tasks.setdefault(key, Task(key, None))
+            task.result = value
+            task.done = True
+            task.cached = cached
+        return key
+
+    def result(self, key):
+        return self.tasks[key].result
+
+    def fetched(self):
+        """Return ``{key: result}`` for tasks that ran or were derived (not cache hits)."""
+        return {key: task.result for key, task in self.tasks.items() if task.done and not task.cached}
+
+    def _ready(self, running):
+        return [
+            task for task in self.tasks.values()
+            if not task.done and task.key not in running and all(self.tasks[dep].done for dep in task.deps)
+        ]
+
+    @staticmethod
+    def _timed(task):
+        start = time.perf_counter()
+        result = task.fn(*task.args)
+        return result, time.perf_counter() - start
+
+    def run(self, max_workers):
+        start = time.perf_counter()
+        running = {}
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            while True:
+                for task in self._ready(running):
+                    running[task.key] = executor.submit(self._timed, task)
+                if not running:
+                    break
+
+                finished, _ = wait(running.values(), return_when=FIRST_COMPLETED)
+                for key in [k for k, f in running.items() if f in finished]:
+                    task = self.tasks[key]
+                    task.result, task.duration = running.pop(key).result()
+                    task.done = True
+                    if task.then:
+                        task.then(self, task.result)
+
+        pending = [key for key, task in self.tasks.items() if not task.done]
+        if pending:
+            raise RuntimeError(f"Unresolvable task dependencies: {pending}")
+        self.wall_time = time.perf_counter() - start
+
+    def critical_path(self):
+        """Return ``(seconds, [keys])`` for the slowest dependency chain of the last run."""
+        memo = {}
+
+        def longest(key):
+            if key not in memo:
+                task = self.tasks[key]
+                best = (0.0, [])
+                for dep in task.deps:
+                    candidate = longest(dep)
+                    if candidate[0] > best[0]:
+                        best = candidate
+                memo[key] = (best[0] + task.duration, best[1] + [key])
+            return memo[key]
+
+        return max((longest(key) for key in self.tasks), default=(0.0, []), key=lambda path: path[0])
+
+    def summary(self):
+        ran = [task for task in self.tasks.values() if not task.cached and task.fn is not None]
+        cp_time, cp_keys = self.critical_path()
+        return {
+            "tasks": len(self.tasks),
+            "cache_hits": sum(1 for task in self.tasks.values() if task.cached),
+            "fetched": len(ran),
+            "serial_time": sum(task.duration for task in ran),
+            "wall_time": self.wall_time,
+            "critical_path_time": cp_time,
+            "critical_path": cp_keys,
+        }